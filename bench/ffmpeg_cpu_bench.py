@@ -0,0 +1,131 @@
+# bench/ffmpeg_cpu_bench.py
+"""
+CPU per stream for the two music playback paths in cogs/music.py build_source:
+
+- opus copy: FFmpegOpusAudio(codec="copy") — ffmpeg remuxes the Opus packets,
+  discord.py sends them as-is
+- pcm:       FFmpegPCMAudio — ffmpeg decodes to s16le, then discord.py encodes
+  Opus in-process (measured separately when discord.py + libopus are available)
+
+Run from the repo root (needs ffmpeg on PATH; not run in CI):
+
+    python bench/ffmpeg_cpu_bench.py [input] [--seconds 120]
+
+Without an input file a seeded test tone is encoded to Opus/WebM first
+(needs an ffmpeg built with libopus). For numbers that match production,
+pass a real YouTube Opus download (e.g. `yt-dlp -f 251 -o track.webm URL`).
+Output is CPU seconds per minute of audio; divide into 60 to get how many
+concurrent streams one core can carry.
+"""
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Mirrors the args discord.py passes for each source type (see discord/player.py).
+# -ss / -reconnect before_options don't matter for a local file.
+COMMON_BEFORE = ["-nostdin"]
+COMMON_AFTER = ["-vn"]  # cogs.music.FFMPEG_OPTIONS
+OPUS_COPY_ARGS = [
+    "-map_metadata", "-1", "-f", "opus", "-c:a", "copy",
+    "-ar", "48000", "-ac", "2", "-b:a", "128k", "-loglevel", "warning",
+]
+PCM_ARGS = ["-f", "s16le", "-ar", "48000", "-ac", "2", "-loglevel", "warning"]
+
+FRAME_BYTES = 3840  # 20 ms of 48 kHz stereo s16le, what discord.py reads per packet
+
+
+def make_test_input(directory: str, seconds: int) -> str:
+    path = os.path.join(directory, "tone.webm")
+    subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}:sample_rate=48000",
+            "-f", "lavfi", "-i", f"anoisesrc=seed=42:duration={seconds}:sample_rate=48000:amplitude=0.05",
+            "-filter_complex", "amix=inputs=2,aformat=channel_layouts=stereo",
+            "-c:a", "libopus", "-b:a", "128k", path,
+        ],
+        check=True,
+    )
+    return path
+
+
+def children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_ffmpeg(path: str, args: list[str]) -> tuple[float, float, bytes]:
+    """Run one ffmpeg to completion; return (cpu seconds, wall seconds, first chunk of output)."""
+    cmd = ["ffmpeg", *COMMON_BEFORE, "-i", path, *COMMON_AFTER, *args, "pipe:1"]
+    cpu_before = children_cpu()
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, check=True)
+    wall = time.perf_counter() - start
+    return children_cpu() - cpu_before, wall, proc.stdout
+
+
+def encoder_cpu(pcm: bytes) -> float | None:
+    """CPU discord.py's own Opus encoder spends on the PCM path (None if unavailable)."""
+    try:
+        from discord.opus import Encoder, is_loaded, _load_default
+    except Exception:
+        return None
+    if not is_loaded() and not _load_default():
+        return None
+    encoder = Encoder()
+    start = time.process_time()
+    for offset in range(0, len(pcm) - FRAME_BYTES + 1, FRAME_BYTES):
+        encoder.encode(pcm[offset:offset + FRAME_BYTES], Encoder.SAMPLES_PER_FRAME)
+    return time.process_time() - start
+
+
+def duration_of(path: str) -> float:
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        stdout=subprocess.PIPE, text=True, check=True,
+    )
+    return float(out.stdout.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", nargs="?", help="audio file (default: generated Opus/WebM test tone)")
+    parser.add_argument("--seconds", type=int, default=120, help="length of the generated test tone")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        sys.exit("ffmpeg/ffprobe not found on PATH")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input or make_test_input(tmp, args.seconds)
+        minutes = duration_of(path) / 60
+        print(f"input: {path} ({minutes * 60:.0f}s)")
+        print(f"{'path':<22}{'cpu s / audio min':>19}{'wall s':>9}")
+
+        for name, ff_args in (("opus copy", OPUS_COPY_ARGS), ("pcm (ffmpeg only)", PCM_ARGS)):
+            cpu_runs, wall_runs = [], []
+            pcm = b""
+            for _ in range(args.repeat):
+                cpu, wall, out = run_ffmpeg(path, ff_args)
+                cpu_runs.append(cpu)
+                wall_runs.append(wall)
+                pcm = out
+            cpu = min(cpu_runs)
+            print(f"{name:<22}{cpu / minutes:>19.3f}{min(wall_runs):>9.2f}")
+
+            if ff_args is PCM_ARGS:
+                enc = encoder_cpu(pcm)
+                if enc is None:
+                    print(f"{'pcm (+opus encode)':<22}{'n/a (no libopus)':>19}")
+                else:
+                    print(f"{'pcm (+opus encode)':<22}{(cpu + enc) / minutes:>19.3f}")
+
+
+if __name__ == "__main__":
+    main()
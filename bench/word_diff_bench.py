@@ -0,0 +1,78 @@
+# bench/word_diff_bench.py
+"""
+Worst-case timings for moderation._word_diff (the edit-log diff).
+
+Run from the repo root:  python bench/word_diff_bench.py [--repeat N]
+
+Inputs are seeded, so numbers are comparable between runs/commits:
+- small edit in a max-length (4000 char) message
+- full rewrite (nothing in common)
+- changed middle right at EDIT_DIFF_ALIGN_MAX_TOKENS (largest aligned case)
+- changed middle just over it (falls back to one replace hunk)
+- markdown-heavy text (escaping + marker-safe truncation)
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.moderation import EDIT_DIFF_ALIGN_MAX_TOKENS, _word_diff  # noqa: E402
+
+MESSAGE_MAX = 4000
+WORDS = ["cat", "grin", "tea", "hatter", "queen", "croquet", "rabbit", "clock", "mad", "tart"]
+
+
+def words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def clip(text: str) -> str:
+    return text[:MESSAGE_MAX]
+
+
+def cases(rng: random.Random) -> dict:
+    base = clip(words(rng, 1000))
+    mid = len(base) // 2
+    half = EDIT_DIFF_ALIGN_MAX_TOKENS // 4  # words per side; each word is ~2 tokens with its space
+    return {
+        "small edit, 4000 chars": (base, base[:mid] + " inserted words " + base[mid:]),
+        "full rewrite": (clip(words(rng, 1000)), clip(words(rng, 1000))),
+        "middle at align cap": (
+            "head " + words(rng, half) + " tail",
+            "head " + words(rng, half) + " tail",
+        ),
+        "middle over align cap": (
+            "head " + words(rng, half + 50) + " tail",
+            "head " + words(rng, half + 50) + " tail",
+        ),
+        "markdown heavy": (
+            clip(" ".join(f"**{w}**_{w}_~~x~~" for w in words(rng, 600).split())),
+            clip(" ".join(f"`{w}`|{w}|*" for w in words(rng, 600).split())),
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'case':<26}{'median ms':>11}{'max ms':>9}{'out len':>9}")
+    for name, (before, after) in cases(rng).items():
+        timings = []
+        out = ""
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            out = _word_diff(before, after)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<26}{statistics.median(timings):>11.2f}{max(timings):>9.2f}{len(out):>9}")
+
+
+if __name__ == "__main__":
+    main()
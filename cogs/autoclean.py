@@ -1,7 +1,12 @@
 # cogs/autoclean.py
 import asyncio
+import heapq
+import json
 import logging
-from typing import Final, Iterable
+import os
+import time
+from collections import defaultdict
+from typing import Any, Final, Iterable, Optional
 
 import discord
 from discord import app_commands
@@ -12,6 +17,19 @@ import config
 # —— CONFIG ————————————————————————————————————————
 AUTODELETE_SECONDS: Final[int] = 6
 
+# Pending deletions survive restarts here
+PENDING_DELETES_PATH: Final[str] = os.getenv("AUTOCLEAN_PENDING_PATH", "data/autoclean_pending.json")
+PENDING_SAVE_DEBOUNCE_SECONDS: Final[float] = 2.0
+
+# Discord bulk delete: at most 100 ids per call, only for messages younger than 14 days
+BULK_DELETE_MAX: Final[int] = 100
+BULK_DELETE_MAX_AGE_SECONDS: Final[int] = 14 * 24 * 3600 - 600
+# Anything due within this long of the earliest due message rides along in the same batch
+BULK_DELETE_WINDOW_SECONDS: Final[float] = 1.0
+
+# Per-guild command prefixes ({guild_id: "?" or ["?", "!"]}); others use the bot's prefix
+GUILD_PREFIXES: dict[int, Any] = dict(getattr(config, "GUILD_PREFIXES", {}))
+
 # Hardcoded extra exempt channels
 MUSIC_CHANNEL_ID: Final[int] = 1441863803011727380
 
@@ -51,11 +69,221 @@ WARNING_EMBED_FOOTER_SNIPPETS: tuple[str, ...] = (
 LOG = logging.getLogger(__name__)
 
 
+def _load_pending() -> list[tuple[float, int, int]]:
+    try:
+        with open(PENDING_DELETES_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [(float(due), int(cid), int(mid)) for due, cid, mid in data]
+    except FileNotFoundError:
+        return []
+    except Exception:
+        LOG.exception("AutoClean: failed to read pending deletions")
+        return []
+
+
+def _save_pending(entries: list[tuple[float, int, int]]) -> None:
+    try:
+        os.makedirs(os.path.dirname(PENDING_DELETES_PATH) or ".", exist_ok=True)
+        tmp = PENDING_DELETES_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp, PENDING_DELETES_PATH)
+    except Exception:
+        LOG.exception("AutoClean: failed to write pending deletions")
+
+
+def _as_prefix_tuple(prefix: Any) -> Optional[tuple[str, ...]]:
+    """A static prefix (str or list of str) as a tuple; None if it's computed per message."""
+    if isinstance(prefix, str):
+        return (prefix,)
+    if isinstance(prefix, (list, tuple, set, frozenset)) and all(isinstance(p, str) for p in prefix):
+        return tuple(p for p in prefix if p)
+    return None
+
+
+class PrefixResolver:
+    """
+    Precomputed prefix tuples so AutoClean can check `content.startswith(prefixes)`
+    without awaiting bot.get_prefix on every message.
+
+    - Rebuilt automatically when bot.command_prefix is swapped out, or
+      explicitly via invalidate() after GUILD_PREFIXES changes.
+    - Returns None when the bot's prefix is a callable (dynamic per message);
+      callers then fall back to get_prefix.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._source: Any = None
+        self._default: Optional[tuple[str, ...]] = None
+        self._guilds: dict[int, Optional[tuple[str, ...]]] = {}
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        if guild_id is None:
+            self._source = None
+            self._guilds.clear()
+        else:
+            self._guilds.pop(guild_id, None)
+
+    def for_guild(self, guild_id: Optional[int]) -> Optional[tuple[str, ...]]:
+        if self.bot.command_prefix is not self._source:
+            self._source = self.bot.command_prefix
+            self._default = _as_prefix_tuple(self._source)
+            self._guilds.clear()
+        if guild_id is None:
+            return self._default
+        try:
+            return self._guilds[guild_id]
+        except KeyError:
+            override = GUILD_PREFIXES.get(guild_id)
+            resolved = _as_prefix_tuple(override) if override is not None else self._default
+            self._guilds[guild_id] = resolved
+            return resolved
+
+
+class DeletionScheduler:
+    """
+    One task deletes everything AutoClean schedules.
+
+    - A min-heap of (due, channel id, message id) on wall-clock time, so
+      entries still make sense after a restart.
+    - Whatever is due at the same moment is grouped per channel and removed
+      with one bulk delete (single messages and anything too old for bulk
+      delete fall back to a plain delete).
+    - The heap is written to disk (debounced, off the event loop) whenever
+      it changes and reloaded on start; overdue entries run right away.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._heap: list[tuple[float, int, int]] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._save_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def start(self) -> None:
+        for entry in _load_pending():
+            heapq.heappush(self._heap, entry)
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
+        _save_pending(list(self._heap))
+
+    def schedule(self, channel_id: int, message_id: int, delay: float = AUTODELETE_SECONDS) -> None:
+        due = time.time() + delay
+        sooner = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, channel_id, message_id))
+        if sooner:
+            self._wake.set()
+        self._mark_dirty()
+
+    # -- persistence --------------------------------------------------
+    def _mark_dirty(self) -> None:
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._delayed_save())
+
+    async def _delayed_save(self) -> None:
+        await asyncio.sleep(PENDING_SAVE_DEBOUNCE_SECONDS)
+        await asyncio.to_thread(_save_pending, list(self._heap))
+
+    # -- worker -------------------------------------------------------
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            if not self._heap:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    # Woken early if something due sooner gets scheduled
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            horizon = time.time() + BULK_DELETE_WINDOW_SECONDS
+            due: dict[int, list[int]] = defaultdict(list)
+            while self._heap and self._heap[0][0] <= horizon:
+                _, channel_id, message_id = heapq.heappop(self._heap)
+                due[channel_id].append(message_id)
+
+            for channel_id, message_ids in due.items():
+                try:
+                    await self._delete_in_channel(channel_id, message_ids)
+                except Exception:
+                    LOG.exception("AutoClean: scheduled delete failed in channel %s", channel_id)
+            self._mark_dirty()
+
+    async def _delete_in_channel(self, channel_id: int, message_ids: list[int]) -> None:
+        channel = self.bot.get_channel(channel_id)
+        if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+            return  # channel gone: nothing left to delete
+
+        cutoff = time.time() - BULK_DELETE_MAX_AGE_SECONDS
+        bulk: list[int] = []
+        single: list[int] = []
+        for message_id in dict.fromkeys(message_ids):  # dedupe, keep order
+            created = discord.utils.snowflake_time(message_id).timestamp()
+            (bulk if created > cutoff else single).append(message_id)
+
+        for start in range(0, len(bulk), BULK_DELETE_MAX):
+            chunk = bulk[start:start + BULK_DELETE_MAX]
+            if len(chunk) == 1:
+                single.extend(chunk)
+                continue
+            try:
+                await channel.delete_messages([discord.Object(id=mid) for mid in chunk])
+            except discord.HTTPException:
+                # Forbidden: bulk delete needs Manage Messages even for our own messages,
+                # single deletes don't. Anything else (e.g. one aged out): same fallback.
+                single.extend(chunk)
+
+        forbidden = 0
+        for message_id in single:
+            try:
+                await channel.get_partial_message(message_id).delete()
+            except discord.NotFound:
+                pass
+            except discord.Forbidden:
+                forbidden += 1  # someone else's message without Manage Messages
+            except discord.HTTPException:
+                LOG.warning(
+                    "AutoClean: failed to delete message %s in #%s",
+                    message_id,
+                    getattr(channel, "name", "?"),
+                )
+        if forbidden:
+            LOG.warning(
+                "AutoClean: missing permissions to delete %d message(s) in #%s",
+                forbidden,
+                getattr(channel, "name", "?"),
+            )
+
+
 class AutoClean(commands.Cog):
     """Auto-deletes bot clutter and prefix invocations in most channels."""
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.scheduler = DeletionScheduler(bot)
+        self.prefixes = PrefixResolver(bot)
+
+    async def cog_load(self) -> None:
+        self.scheduler.start()
+
+    async def cog_unload(self) -> None:
+        self.scheduler.stop()
 
     def _is_exempt_channel(self, channel: discord.abc.GuildChannel) -> bool:
         if not isinstance(channel, (discord.TextChannel, discord.Thread)):
@@ -103,26 +331,17 @@ class AutoClean(commands.Cog):
                 return
             if message.content and message.content.strip() == "I agree.":
                 return
-            await message.delete(delay=AUTODELETE_SECONDS)
+            self.scheduler.schedule(message.channel.id, message.id)
             return
 
-        prefixes = await self.bot.get_prefix(message)
-        if isinstance(prefixes, str):
-            prefixes = [prefixes]
+        prefixes = self.prefixes.for_guild(message.guild.id)
+        if prefixes is None:
+            # Dynamic prefix: only this case needs the round trip through get_prefix
+            resolved = await self.bot.get_prefix(message)
+            prefixes = (resolved,) if isinstance(resolved, str) else tuple(resolved)
 
-        if any(message.content.startswith(p) for p in prefixes):
-            try:
-                await asyncio.sleep(AUTODELETE_SECONDS)
-                await message.delete()
-            except discord.NotFound:
-                pass
-            except discord.Forbidden:
-                LOG.warning(
-                    "AutoClean: missing permissions to delete user prefix cmd in #%s",
-                    getattr(message.channel, "name", "?"),
-                )
-            except Exception:
-                LOG.exception("AutoClean: failed to delete user prefix invocation")
+        if prefixes and message.content.startswith(prefixes):
+            self.scheduler.schedule(message.channel.id, message.id)
 
     @commands.Cog.listener()
     async def on_app_command_completion(
@@ -137,18 +356,21 @@ class AutoClean(commands.Cog):
             return
 
         try:
-            if interaction.response.is_done():
-                original = await interaction.original_response()
-                if original:
-                    await asyncio.sleep(AUTODELETE_SECONDS)
-                    await original.delete()
+            if not interaction.response.is_done():
+                return
+            original = await interaction.original_response()
+            if not original:
+                return
+            if not original.flags.ephemeral:
+                self.scheduler.schedule(channel.id, original.id)
+                return
+            # Ephemeral responses aren't channel messages: only the interaction
+            # webhook can delete them, and its token lives in memory (15 min),
+            # so these can't go through the persisted scheduler.
+            await asyncio.sleep(AUTODELETE_SECONDS)
+            await interaction.delete_original_response()
         except discord.NotFound:
             pass
-        except discord.Forbidden:
-            logging.warning(
-                "AutoClean: cannot delete original response in #%s (missing perms).",
-                getattr(interaction.channel, "name", "?"),
-            )
         except Exception:
             logging.exception("AutoClean: on_app_command_completion failed")
 
@@ -173,4 +395,4 @@ def _gather_message_text(message: discord.Message) -> str:
 
 
 async def setup(bot: commands.Bot):
-    await bot.add_cog(AutoClean(bot))
\ No newline at end of file
+    await bot.add_cog(AutoClean(bot))
@@ -7,7 +7,8 @@ import json
 import os
 import random
 import re
-from collections import defaultdict
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -16,7 +17,8 @@ from zoneinfo import ZoneInfo
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI
 
 # ──────────────────────────────────────────────────────────────
 # CONFIG
@@ -51,17 +53,44 @@ TEST_ALLOWED_ROLE_IDS = {
 STATE_DIR = Path("data")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 STATE_PATH = STATE_DIR / "daily_cheshire_news_state.json"
+TRANSCRIPT_PATH = STATE_DIR / "daily_cheshire_news_transcript.json"
+PET_INDEX_PATH = STATE_DIR / "daily_cheshire_news_pets.json"
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+# Per-call deadlines (seconds, all attempts included) and retry policy
+OPENAI_DEADLINES = {
+    "news": 90.0,
+    "pet_caption": 40.0,
+}
+OPENAI_MAX_ATTEMPTS = 3
+OPENAI_RETRY_BASE_SECONDS = 1.5          # backoff doubles per attempt, with ±50% jitter
+OPENAI_RETRYABLE = (
+    asyncio.TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+USAGE_LATENCY_SAMPLES = 50
+
 POST_WINDOW_MINUTES = 10
 IGNORED_PREFIXES = ("!", "/", ".")
 MAX_LINE_LENGTH = 260
 MAX_TRANSCRIPT_LINES = 180
 MAX_EMBED_BODY_LENGTH = 3500
 PET_LOOKBACK_HOURS = 48
+PET_PICK_ATTEMPTS = 3                    # candidates tried when the chosen post turns out to be gone
 MAX_USED_PET_IDS = 100
 
+# Rolling transcript: source-channel messages are cleaned once as they arrive
+TRANSCRIPT_RETENTION_HOURS = 25          # a little over the 24h window, for late posts
+TRANSCRIPT_SAVE_DELAY_SECONDS = 30
+BACKFILL_OVERLAP_SECONDS = 120           # history re-read before the watermark (messages still in flight)
+HISTORY_FETCH_CONCURRENCY = 4            # channels read at once
+HISTORY_CHANNEL_TIMEOUT_SECONDS = 45
+HISTORY_TOTAL_BUDGET_SECONDS = 90
+
 MENTION_RE = re.compile(r"<@!?(?P<id>\d+)>")
 ROLE_MENTION_RE = re.compile(r"<@&(?P<id>\d+)>")
 CHANNEL_MENTION_RE = re.compile(r"<#(?P<id>\d+)>")
@@ -156,6 +185,113 @@ class DailyCheshireNewsState:
         STATE_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
 
+@dataclass
+class FeatureUsage:
+    calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=USAGE_LATENCY_SAMPLES))
+
+    def describe(self) -> str:
+        text = (
+            f"{self.calls} calls, {self.failures} failed, {self.retries} retries, "
+            f"{self.prompt_tokens} prompt + {self.completion_tokens} completion tokens"
+        )
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            avg = sum(ordered) / len(ordered)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            text += f", latency avg {avg:.1f}s / p95 {p95:.1f}s / max {ordered[-1]:.1f}s"
+        return text
+
+
+@dataclass
+class TranscriptEntry:
+    channel_id: int
+    posted_at: float  # unix seconds
+    author_name: str
+    text: str         # already through clean_message_content
+
+
+@dataclass
+class BackfillReport:
+    """Per-channel outcome of a history read: "ok", "timeout", "forbidden", "missing", "error" or "budget"."""
+    added: int = 0
+    elapsed: float = 0.0
+    channels: dict[int, str] = field(default_factory=dict)
+    counts: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return all(status == "ok" for status in self.channels.values())
+
+    def summary(self) -> str:
+        failed = {cid: status for cid, status in self.channels.items() if status != "ok"}
+        text = f"{self.added} messages from {len(self.channels) - len(failed)}/{len(self.channels)} channels in {self.elapsed:.1f}s"
+        if failed:
+            text += " (partial: " + ", ".join(f"{cid}={status}" for cid, status in failed.items()) + ")"
+        return text
+
+
+class TranscriptStore:
+    """
+    The last ~24h of cleaned source-channel messages, keyed by message id.
+
+    Filled live by the cog's listeners (new, edited and deleted messages),
+    so building the news is a local query instead of walking every channel's
+    history. `watermark` is when the last successfully written snapshot was
+    taken: everything posted before it is on disk, so a restart only reads
+    history from there on.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[int, TranscriptEntry] = {}
+        self.watermark: float | None = None
+
+    @classmethod
+    def load(cls) -> "TranscriptStore":
+        store = cls()
+        if TRANSCRIPT_PATH.exists():
+            try:
+                data = json.loads(TRANSCRIPT_PATH.read_text(encoding="utf-8"))
+                store.watermark = data.get("watermark")
+                for mid, cid, ts, author, text in data.get("messages") or []:
+                    store.entries[int(mid)] = TranscriptEntry(int(cid), float(ts), author, text)
+            except Exception:
+                return cls()
+        store.prune()
+        return store
+
+    def to_payload(self, watermark: float | None = None) -> dict:
+        return {
+            "watermark": self.watermark if watermark is None else watermark,
+            "messages": [
+                [mid, e.channel_id, e.posted_at, e.author_name, e.text]
+                for mid, e in self.entries.items()
+            ],
+        }
+
+    def prune(self, now: float | None = None) -> None:
+        cutoff = (now or time.time()) - TRANSCRIPT_RETENTION_HOURS * 3600
+        stale = [mid for mid, e in self.entries.items() if e.posted_at < cutoff]
+        for mid in stale:
+            del self.entries[mid]
+
+    def put(self, message_id: int, entry: TranscriptEntry) -> None:
+        self.entries[message_id] = entry
+
+    def discard(self, message_id: int) -> bool:
+        return self.entries.pop(message_id, None) is not None
+
+    def window(self, start: datetime, end: datetime) -> list[TranscriptEntry]:
+        lo, hi = start.timestamp(), end.timestamp()
+        hits = [e for e in self.entries.values() if lo <= e.posted_at <= hi]
+        hits.sort(key=lambda e: e.posted_at)
+        return hits
+
+
 # ──────────────────────────────────────────────────────────────
 # HELPERS
 # ──────────────────────────────────────────────────────────────
@@ -214,14 +350,16 @@ def replace_mentions(text: str, guild: discord.Guild) -> str:
 
 
 def clean_message_content(message: discord.Message) -> str:
-    content = message.content or ""
+    return clean_text(message.content or "", message.guild)
+
 
+def clean_text(content: str, guild: discord.Guild) -> str:
     if is_command_like(content):
         return ""
 
     content = BAD_CONTROL_RE.sub("", content)
     content = clean_custom_emoji(content)
-    content = replace_mentions(content, message.guild)
+    content = replace_mentions(content, guild)
     content = normalize_space(content)
 
     if not content:
@@ -389,13 +527,97 @@ def attachment_is_image(attachment: discord.Attachment) -> bool:
     return attachment.filename.lower().endswith(VALID_IMAGE_EXTENSIONS)
 
 
+def message_image_url(msg: discord.Message) -> str | None:
+    for attachment in msg.attachments:
+        if attachment_is_image(attachment):
+            return attachment.url
+
+    for embed in msg.embeds:
+        if embed.image and embed.image.url and is_supported_image_url(embed.image.url):
+            return embed.image.url
+        if embed.thumbnail and embed.thumbnail.url and is_supported_image_url(embed.thumbnail.url):
+            return embed.thumbnail.url
+
+    return None
+
+
 @dataclass
 class PetCandidate:
     message_id: int
-    image_url: str
+    image_url: str  # signed CDN URL, expires after ~24h: refreshed at pick time
     author_name: str
     posted_at: datetime
     context_text: str
+    channel_id: int = PET_SOURCE_CHANNEL_ID
+
+
+class PetIndex:
+    """
+    Image posts from the pet channel within the lookback window, keyed by
+    message id. Kept current by the cog's listeners so picking the Menace of
+    the Day never reads channel history.
+    """
+
+    def __init__(self) -> None:
+        self.candidates: dict[int, PetCandidate] = {}
+
+    @classmethod
+    def load(cls) -> "PetIndex":
+        index = cls()
+        if PET_INDEX_PATH.exists():
+            try:
+                data = json.loads(PET_INDEX_PATH.read_text(encoding="utf-8"))
+                for raw in data.get("candidates") or []:
+                    index.candidates[int(raw["message_id"])] = PetCandidate(
+                        message_id=int(raw["message_id"]),
+                        image_url=raw["image_url"],
+                        author_name=raw["author_name"],
+                        posted_at=datetime.fromtimestamp(float(raw["posted_at"]), tz=TIMEZONE),
+                        context_text=raw.get("context_text") or "",
+                        channel_id=int(raw.get("channel_id") or PET_SOURCE_CHANNEL_ID),
+                    )
+            except Exception:
+                return cls()
+        index.prune()
+        return index
+
+    def to_payload(self) -> dict:
+        return {
+            "candidates": [
+                {
+                    "message_id": pet.message_id,
+                    "image_url": pet.image_url,
+                    "author_name": pet.author_name,
+                    "posted_at": pet.posted_at.timestamp(),
+                    "context_text": pet.context_text,
+                    "channel_id": pet.channel_id,
+                }
+                for pet in self.candidates.values()
+            ]
+        }
+
+    def prune(self, now: datetime | None = None) -> None:
+        cutoff = (now or local_now()) - timedelta(hours=PET_LOOKBACK_HOURS)
+        stale = [mid for mid, pet in self.candidates.items() if pet.posted_at < cutoff]
+        for mid in stale:
+            del self.candidates[mid]
+
+    def add(self, pet: PetCandidate) -> None:
+        self.candidates[pet.message_id] = pet
+
+    def discard(self, message_id: int) -> bool:
+        return self.candidates.pop(message_id, None) is not None
+
+    def newest(self, end_time: datetime, exclude: set[int]) -> PetCandidate | None:
+        """Newest unused candidate posted in the lookback window ending at end_time."""
+        start_time = end_time - timedelta(hours=PET_LOOKBACK_HOURS)
+        best: PetCandidate | None = None
+        for pet in self.candidates.values():
+            if pet.message_id in exclude or not (start_time <= pet.posted_at <= end_time):
+                continue
+            if best is None or pet.posted_at > best.posted_at:
+                best = pet
+        return best
 
 
 # ──────────────────────────────────────────────────────────────
@@ -405,27 +627,314 @@ class DailyCheshireNews(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.state = DailyCheshireNewsState.load()
-        self.client: OpenAI | None = None
+        self.transcripts = TranscriptStore.load()
+        self.pets = PetIndex.load()
+        self.client: AsyncOpenAI | None = None
+        self.usage: dict[str, FeatureUsage] = defaultdict(FeatureUsage)
         self._startup_task: asyncio.Task | None = None
+        self._transcript_save_task: asyncio.Task | None = None
+        self.last_backfill: BackfillReport | None = None
+        # Set while a history gap hasn't been fully read back: saves must not move the watermark past it
+        self._watermark_ceiling: float | None = None
 
         api_key = os.getenv("OPENAI_API_KEY", "").strip()
         if api_key:
-            self.client = OpenAI(api_key=api_key)
+            # One client = one pooled HTTP connection set; retries are ours (see complete()).
+            self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
 
     async def cog_load(self) -> None:
         self._startup_task = asyncio.create_task(self._start_loop_after_ready())
 
-    def cog_unload(self) -> None:
+    async def cog_unload(self) -> None:
         if self.post_loop.is_running():
             self.post_loop.cancel()
         if self._startup_task and not self._startup_task.done():
             self._startup_task.cancel()
+        if self._transcript_save_task and not self._transcript_save_task.done():
+            self._transcript_save_task.cancel()
+        self.save_transcripts()
+        self.save_pets()
+        if self.client:
+            await self.client.close()
 
     async def _start_loop_after_ready(self) -> None:
         await self.bot.wait_until_ready()
+        await self.backfill_after_downtime()
         if not self.post_loop.is_running():
             self.post_loop.start()
 
+    # ── rolling transcript ───────────────────────────────────────
+    def _transcript_payload(self) -> tuple[float, str]:
+        """Serialise the store, stamped with the moment it was taken (the watermark it would give)."""
+        self.transcripts.prune()
+        taken_at = time.time()
+        if self._watermark_ceiling is not None:
+            taken_at = min(taken_at, self._watermark_ceiling)
+        return taken_at, json.dumps(self.transcripts.to_payload(watermark=taken_at))
+
+    def save_transcripts(self, snapshot: tuple[float, str] | None = None) -> bool:
+        taken_at, payload = snapshot or self._transcript_payload()
+        try:
+            TRANSCRIPT_PATH.write_text(payload, encoding="utf-8")
+        except Exception as e:
+            print(f"[DailyCheshireNews] Saving transcript store failed: {e}")
+            return False
+        return True
+
+    def _mark_transcripts_dirty(self) -> None:
+        if self._transcript_save_task is None or self._transcript_save_task.done():
+            self._transcript_save_task = asyncio.create_task(self._delayed_transcript_save())
+
+    async def _delayed_transcript_save(self) -> None:
+        await asyncio.sleep(TRANSCRIPT_SAVE_DELAY_SECONDS)
+        # Serialise here (the listeners mutate the store on this loop), write in a thread
+        snapshot = self._transcript_payload()
+        if await asyncio.to_thread(self.save_transcripts, snapshot):
+            self.transcripts.watermark = snapshot[0]  # only what actually reached disk counts
+
+    def save_pets(self, payload: str | None = None) -> None:
+        try:
+            PET_INDEX_PATH.write_text(payload or self._pet_payload(), encoding="utf-8")
+        except Exception as e:
+            print(f"[DailyCheshireNews] Saving pet index failed: {e}")
+
+    def _pet_payload(self) -> str:
+        self.pets.prune()
+        return json.dumps(self.pets.to_payload())
+
+    async def _save_pets_soon(self) -> None:
+        # Pet posts are rare; write right away (off the loop) rather than debouncing
+        await asyncio.to_thread(self.save_pets, self._pet_payload())
+
+    def index_pet_message(self, msg: discord.Message) -> bool:
+        """Add a pet-channel image post to the candidate index. Returns True if it was added."""
+        if msg.author.bot:
+            return False
+        image_url = message_image_url(msg)
+        if not image_url:
+            return False
+        self.pets.add(
+            PetCandidate(
+                message_id=msg.id,
+                image_url=image_url,
+                author_name=discord.utils.escape_markdown(msg.author.display_name, as_needed=True),
+                posted_at=msg.created_at,
+                context_text=clean_message_content(msg),
+                channel_id=msg.channel.id,
+            )
+        )
+        return True
+
+    def ingest_message(self, msg: discord.Message) -> bool:
+        """Clean and store a source-channel message (once). Returns True if it was kept."""
+        if msg.author.bot or not msg.content:
+            return False
+        cleaned = clean_message_content(msg)
+        if not cleaned:
+            return False
+        author_name = discord.utils.escape_markdown(msg.author.display_name, as_needed=True)
+        self.transcripts.put(msg.id, TranscriptEntry(msg.channel.id, msg.created_at.timestamp(), author_name, cleaned))
+        return True
+
+    async def backfill_after_downtime(self) -> None:
+        """
+        Read channel history for everything after the persisted watermark
+        (never more than 24h), however short the restart was: messages that
+        arrived after the last save were lost with the process too.
+        """
+        now = time.time()
+        since = now - 24 * 3600
+        pet_since = now - PET_LOOKBACK_HOURS * 3600
+        watermark = self.transcripts.watermark
+        if watermark is not None:
+            since = max(since, watermark - BACKFILL_OVERLAP_SECONDS)
+            pet_since = max(pet_since, watermark - BACKFILL_OVERLAP_SECONDS)
+        # Live messages keep saving meanwhile; don't let those saves cover the unread gap
+        self._watermark_ceiling = watermark if watermark is not None else since
+
+        after = datetime.fromtimestamp(since, tz=TIMEZONE)
+        pet_after = datetime.fromtimestamp(pet_since, tz=TIMEZONE)
+        self.last_backfill, pets_complete = await asyncio.gather(
+            self.read_source_history(after),
+            self.read_pet_history(pet_after),
+        )
+        if self.last_backfill.added or not self.last_backfill.complete:
+            print(f"[DailyCheshireNews] Backfill after downtime: {self.last_backfill.summary()}")
+        if self.last_backfill.complete and pets_complete:
+            self._watermark_ceiling = None  # otherwise the next restart reads the gap again
+        self._mark_transcripts_dirty()
+
+    async def read_pet_history(self, after: datetime) -> bool:
+        """Fill the pet candidate index for a stretch we weren't listening. Returns False if cut short."""
+        channel = self.bot.get_channel(PET_SOURCE_CHANNEL_ID)
+        if not isinstance(channel, discord.TextChannel):
+            return True
+
+        async def read() -> int:
+            added = 0
+            async for msg in channel.history(limit=None, after=after, oldest_first=True):
+                if msg.id not in self.pets.candidates and self.index_pet_message(msg):
+                    added += 1
+            return added
+
+        complete = False
+        try:
+            added = await asyncio.wait_for(read(), timeout=HISTORY_CHANNEL_TIMEOUT_SECONDS)
+            complete = True
+            if added:
+                print(f"[DailyCheshireNews] Indexed {added} pet posts after downtime.")
+        except asyncio.TimeoutError:
+            print("[DailyCheshireNews] Pet channel backfill timed out; index is partial.")
+        except discord.Forbidden:
+            complete = True  # retrying after a restart won't help
+            print("[DailyCheshireNews] No access to the pet channel history.")
+        except Exception as e:
+            print(f"[DailyCheshireNews] Pet channel backfill failed: {e}")
+        await self._save_pets_soon()
+        return complete
+
+    async def read_source_history(self, after: datetime) -> BackfillReport:
+        """
+        Read every source channel's history since `after` into the store.
+
+        Channels are read concurrently (at most HISTORY_FETCH_CONCURRENCY at a
+        time), each with its own timeout, all within one overall budget, so
+        this takes about as long as the slowest channel. Messages are stored
+        as they're read, so a channel that times out still contributes what it
+        got; the report says which channels were incomplete and why.
+        """
+        report = BackfillReport()
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(HISTORY_FETCH_CONCURRENCY)
+
+        async def read_channel(channel: discord.TextChannel) -> None:
+            async for msg in channel.history(limit=None, after=after, oldest_first=True):
+                if msg.id not in self.transcripts.entries and self.ingest_message(msg):
+                    report.counts[channel.id] = report.counts.get(channel.id, 0) + 1
+
+        async def guarded(channel: discord.TextChannel) -> None:
+            try:
+                async with semaphore:  # the per-channel timeout starts once it's our turn
+                    await asyncio.wait_for(read_channel(channel), timeout=HISTORY_CHANNEL_TIMEOUT_SECONDS)
+                report.channels[channel.id] = "ok"
+            except asyncio.TimeoutError:
+                report.channels[channel.id] = "timeout"
+            except discord.Forbidden:
+                report.channels[channel.id] = "forbidden"
+            except Exception as e:
+                report.channels[channel.id] = "error"
+                print(f"[DailyCheshireNews] Reading history of {channel.id} failed: {e}")
+
+        jobs: list[asyncio.Task] = []
+        for channel_id in SOURCE_CHANNEL_IDS:
+            channel = self.bot.get_channel(channel_id)
+            if not isinstance(channel, discord.TextChannel):
+                report.channels[channel_id] = "missing"
+                continue
+            jobs.append(asyncio.create_task(guarded(channel)))
+
+        if jobs:
+            _, pending = await asyncio.wait(jobs, timeout=HISTORY_TOTAL_BUDGET_SECONDS)
+            for job in pending:
+                job.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        for channel_id in SOURCE_CHANNEL_IDS:
+            report.channels.setdefault(channel_id, "budget")  # overall budget ran out first
+
+        report.added = sum(report.counts.values())
+        report.elapsed = time.monotonic() - started
+        return report
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.guild is None:
+            return
+        if message.channel.id == PET_SOURCE_CHANNEL_ID:
+            if self.index_pet_message(message):
+                await self._save_pets_soon()
+        if message.channel.id in SOURCE_CHANNEL_IDS and self.ingest_message(message):
+            self._mark_transcripts_dirty()
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        if payload.channel_id == PET_SOURCE_CHANNEL_ID:
+            await self._reindex_pet_message(payload)
+            return
+        if payload.channel_id not in SOURCE_CHANNEL_IDS or "content" not in payload.data:
+            return
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        if guild is None:
+            return
+
+        author = payload.data.get("author") or {}
+        if author.get("bot"):
+            return
+        cleaned = clean_text(payload.data.get("content") or "", guild)
+        if not cleaned:
+            if self.transcripts.discard(payload.message_id):
+                self._mark_transcripts_dirty()
+            return
+
+        existing = self.transcripts.entries.get(payload.message_id)
+        if existing:
+            existing.text = cleaned
+        else:
+            # Wasn't usable before the edit (or predates the store)
+            posted_at = discord.utils.snowflake_time(payload.message_id).timestamp()
+            if posted_at < time.time() - TRANSCRIPT_RETENTION_HOURS * 3600:
+                return
+            member = guild.get_member(int(author.get("id") or 0))
+            name = member.display_name if member else (author.get("global_name") or author.get("username") or "someone")
+            self.transcripts.put(
+                payload.message_id,
+                TranscriptEntry(
+                    payload.channel_id,
+                    posted_at,
+                    discord.utils.escape_markdown(name, as_needed=True),
+                    cleaned,
+                ),
+            )
+        self._mark_transcripts_dirty()
+
+    async def _reindex_pet_message(self, payload: discord.RawMessageUpdateEvent) -> None:
+        """Link previews arrive as edits, so an edit can turn a pet post into a candidate (or stop it being one)."""
+        if "embeds" not in payload.data and "attachments" not in payload.data:
+            return
+        if (payload.data.get("author") or {}).get("bot"):
+            return
+        channel = self.bot.get_channel(payload.channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            return
+        try:
+            msg = await channel.fetch_message(payload.message_id)
+        except discord.NotFound:
+            if self.pets.discard(payload.message_id):
+                await self._save_pets_soon()
+            return
+        except discord.HTTPException:
+            return
+        if msg.created_at < local_now() - timedelta(hours=PET_LOOKBACK_HOURS):
+            return
+        if self.index_pet_message(msg) or self.pets.discard(msg.id):
+            await self._save_pets_soon()
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        if self.transcripts.discard(payload.message_id):
+            self._mark_transcripts_dirty()
+        if self.pets.discard(payload.message_id):
+            await self._save_pets_soon()
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        removed = [mid for mid in payload.message_ids if self.transcripts.discard(mid)]
+        if removed:
+            self._mark_transcripts_dirty()
+        removed_pets = [mid for mid in payload.message_ids if self.pets.discard(mid)]
+        if removed_pets:
+            await self._save_pets_soon()
+
     @tasks.loop(minutes=1)
     async def post_loop(self) -> None:
         now = local_now()
@@ -479,7 +988,10 @@ class DailyCheshireNews(commands.Cog):
             await channel.send(embeds=embeds)
             self._remember_used_pet(used_pet_message_id, pool="test")
             self.state.save()
-            await interaction.followup.send("Test post sent. 🐾", ephemeral=True)
+            note = ""
+            if self.last_backfill and not self.last_backfill.complete:
+                note = f"\nTranscript is partial since the last restart: {self.last_backfill.summary()}"
+            await interaction.followup.send("Test post sent. 🐾" + note, ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"Test failed: `{e}`", ephemeral=True)
 
@@ -512,6 +1024,26 @@ class DailyCheshireNews(commands.Cog):
         except Exception as e:
             await interaction.followup.send(f"Repost failed: `{e}`", ephemeral=True)
 
+    @app_commands.command(
+        name="daily_cheshire_news_stats",
+        description="Show OpenAI token usage and latency for Daily Cheshire News."
+    )
+    async def daily_cheshire_news_stats(self, interaction: discord.Interaction) -> None:
+        if not interaction.guild or not isinstance(interaction.user, discord.Member):
+            await interaction.response.send_message("Guild only.", ephemeral=True)
+            return
+
+        if not has_test_role(interaction.user):
+            await interaction.response.send_message("You don’t have paws for that.", ephemeral=True)
+            return
+
+        if not self.usage:
+            await interaction.response.send_message("No OpenAI calls since the last restart.", ephemeral=True)
+            return
+
+        lines = [f"**{feature}**: {usage.describe()}" for feature, usage in sorted(self.usage.items())]
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
     def _remember_used_pet(self, message_id: int | None, pool: str) -> None:
         if not message_id:
             return
@@ -567,101 +1099,58 @@ class DailyCheshireNews(commands.Cog):
         start_time: datetime,
         end_time: datetime,
     ) -> tuple[list[str], dict[str, list[str]], int]:
-        collected: list[tuple[datetime, str, str]] = []
-
-        for channel_id in SOURCE_CHANNEL_IDS:
-            channel = self.bot.get_channel(channel_id)
-            if not isinstance(channel, discord.TextChannel):
-                continue
-
-            try:
-                async for msg in channel.history(limit=None, after=start_time, oldest_first=True):
-                    if msg.created_at.replace(tzinfo=msg.created_at.tzinfo or TIMEZONE) > end_time:
-                        continue
-                    if msg.author.bot:
-                        continue
-                    if not msg.content:
-                        continue
-
-                    cleaned = clean_message_content(msg)
-                    if not cleaned:
-                        continue
-
-                    author_name = discord.utils.escape_markdown(msg.author.display_name, as_needed=True)
-                    collected.append((msg.created_at, author_name, cleaned))
-            except discord.Forbidden:
-                continue
-            except Exception:
-                continue
-
-        collected.sort(key=lambda item: item[0])
+        # Local query over the rolling store; the listeners keep it current.
+        collected = self.transcripts.window(start_time, end_time)
 
         grouped: dict[str, list[str]] = defaultdict(list)
         lines = []
 
-        for _, author_name, cleaned in collected:
-            grouped[author_name].append(cleaned)
-            lines.append(f"{author_name}: {cleaned}")
+        for entry in collected:
+            grouped[entry.author_name].append(entry.text)
+            lines.append(f"{entry.author_name}: {entry.text}")
 
         lines = choose_relevant_lines(lines, MAX_TRANSCRIPT_LINES)
         return lines, dict(grouped), len(collected)
 
     async def find_menace_candidate(self, end_time: datetime, pool: str) -> PetCandidate | None:
-        channel = self.bot.get_channel(PET_SOURCE_CHANNEL_ID)
-        if not isinstance(channel, discord.TextChannel):
-            return None
-
-        start_time = end_time - timedelta(hours=PET_LOOKBACK_HOURS)
+        # Local query over the listener-fed index; no channel history involved.
         if pool == "test":
             used_ids = set(self.state.used_test_pet_message_ids)
         else:
             used_ids = set(self.state.used_live_pet_message_ids)
 
-        try:
-            async for msg in channel.history(limit=None, after=start_time, oldest_first=False):
-                if msg.created_at.replace(tzinfo=msg.created_at.tzinfo or TIMEZONE) > end_time:
-                    continue
-                if msg.author.bot:
-                    continue
-                if msg.id in used_ids:
-                    continue
-
-                image_url: str | None = None
-
-                for attachment in msg.attachments:
-                    if attachment_is_image(attachment):
-                        image_url = attachment.url
-                        break
-
-                if not image_url:
-                    for embed in msg.embeds:
-                        if embed.image and embed.image.url and is_supported_image_url(embed.image.url):
-                            image_url = embed.image.url
-                            break
-                        if embed.thumbnail and embed.thumbnail.url and is_supported_image_url(embed.thumbnail.url):
-                            image_url = embed.thumbnail.url
-                            break
-
-                if not image_url:
-                    continue
-
-                context_text = clean_message_content(msg)
-                author_name = discord.utils.escape_markdown(msg.author.display_name, as_needed=True)
-
-                return PetCandidate(
-                    message_id=msg.id,
-                    image_url=image_url,
-                    author_name=author_name,
-                    posted_at=msg.created_at,
-                    context_text=context_text,
-                )
-        except discord.Forbidden:
-            return None
-        except Exception:
-            return None
-
+        for _ in range(PET_PICK_ATTEMPTS):
+            pet = self.pets.newest(end_time=end_time, exclude=used_ids)
+            if pet is None or await self.refresh_pet_image(pet):
+                return pet
+            used_ids.add(pet.message_id)
         return None
 
+    async def refresh_pet_image(self, pet: PetCandidate) -> bool:
+        """
+        Re-fetch the chosen post for a current image URL (the indexed one may
+        have expired). Returns False, and drops it from the index, if the post
+        or its image is gone.
+        """
+        channel = self.bot.get_channel(pet.channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            return True
+        try:
+            msg = await channel.fetch_message(pet.message_id)
+        except discord.NotFound:
+            msg = None
+        except discord.HTTPException as e:
+            print(f"[DailyCheshireNews] Refreshing pet post {pet.message_id} failed: {e}")
+            return True  # keep the stored URL; it may still work
+
+        image_url = message_image_url(msg) if msg else None
+        if not image_url:
+            self.pets.discard(pet.message_id)
+            await self._save_pets_soon()
+            return False
+        pet.image_url = image_url
+        return True
+
     async def generate_pet_caption(self, pet: PetCandidate) -> str | None:
         if not self.client:
             return None
@@ -700,8 +1189,8 @@ class DailyCheshireNews(commands.Cog):
         ]
 
         try:
-            completion = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            completion = await self.complete(
+                "pet_caption",
                 model=OPENAI_MODEL,
                 temperature=1.0,
                 max_completion_tokens=120,
@@ -718,6 +1207,44 @@ class DailyCheshireNews(commands.Cog):
 
         return None
 
+    async def complete(self, feature: str, **request):
+        """
+        chat.completions.create with a deadline covering all attempts, jittered
+        exponential backoff on transient errors, and per-feature usage/latency
+        accounting (see /daily_cheshire_news_stats).
+        """
+        usage = self.usage[feature]
+        deadline = time.monotonic() + OPENAI_DEADLINES.get(feature, 60.0)
+        usage.calls += 1
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                completion = await asyncio.wait_for(
+                    self.client.chat.completions.create(**request),
+                    timeout=max(0.0, deadline - started),
+                )
+            except OPENAI_RETRYABLE as e:
+                attempt += 1
+                delay = OPENAI_RETRY_BASE_SECONDS * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                if attempt >= OPENAI_MAX_ATTEMPTS or time.monotonic() + delay >= deadline:
+                    usage.failures += 1
+                    raise
+                usage.retries += 1
+                print(f"[DailyCheshireNews] OpenAI {feature} attempt {attempt} failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                usage.failures += 1
+                raise
+
+            usage.latencies.append(time.monotonic() - started)
+            if completion.usage:
+                usage.prompt_tokens += completion.usage.prompt_tokens or 0
+                usage.completion_tokens += completion.usage.completion_tokens or 0
+            return completion
+
     def apply_pet_to_news_embed(self, embed: discord.Embed, pet: PetCandidate, caption: str | None) -> None:
         description = caption or "Menace located. Visual evidence attached."
         embed.add_field(name="Menace of the Day", value=description, inline=False)
@@ -775,8 +1302,8 @@ class DailyCheshireNews(commands.Cog):
         )
 
         try:
-            completion = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            completion = await self.complete(
+                "news",
                 model=OPENAI_MODEL,
                 temperature=1.0,
                 max_completion_tokens=900,
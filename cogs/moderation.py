@@ -8,12 +8,19 @@ Key points:
 """
 
 import re
+import os
+import gzip
 import json
+import shutil
 import asyncio
+import hashlib
 import logging
-from datetime import timedelta
-from typing import Optional, Dict, Any, List, Set
+from collections import deque
+from difflib import SequenceMatcher
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Set, Deque, Tuple
 
+import aiohttp
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -38,6 +45,17 @@ SPAM_MAX_MESSAGES = 6
 REPEAT_ENABLED = True
 REPEAT_WINDOW_SECONDS = 10
 
+# Attachment spam: same file (by fingerprint) posted by many users, or many times by one
+ATTACHMENT_SPAM_ENABLED = True
+ATTACHMENT_WINDOW_SECONDS = 120
+ATTACHMENT_MAX_USERS = 4          # distinct users posting the same file in the window
+ATTACHMENT_MAX_PER_USER = 3       # same user posting the same file in the window
+ATTACHMENT_SPAM_DELETE = False    # False = modlog only (same as spam/repeat checks)
+ATTACHMENT_MAX_PER_MESSAGE = 4    # only fingerprint the first N attachments of a message
+ATTACHMENT_BUCKET_MAX = ATTACHMENT_MAX_USERS * ATTACHMENT_MAX_PER_USER  # newest hits kept per fingerprint
+ATTACHMENT_HEAD_BYTES = 2048      # ranged fetch of the first N bytes (never the whole file)
+ATTACHMENT_FETCH_TIMEOUT = 3
+
 # Channels exempt from ALL AutoMod checks (NO deletes, NO spam checks, etc.)
 EXEMPT_CHANNEL_IDS: Set[int] = {
     config.FFXIV_WIKI_CHANNEL_ID,  # #ffxiv-wiki
@@ -59,6 +77,27 @@ INVITE_RE = re.compile(
 # Limit for how much message content we log in embeds
 LOG_MESSAGE_CONTENT_MAX = 1900
 
+# Edit logs: word-level diff of the changed hunks only
+EDIT_DIFF_CONTEXT_WORDS = 6     # unchanged words shown around each change
+EDIT_DIFF_ALIGN_MAX_TOKENS = 600  # bigger changed regions are shown as one replace hunk
+
+# Where /lockdown keeps the pre-lock @everyone overwrites (so /unlockdown can restore them)
+LOCKDOWN_DB_PATH = "data/lockdown.json"
+
+# How many channel permission edits /lockdown and /unlockdown run at once.
+# discord.py already waits out 429s per route; this just keeps us from
+# hammering the global limit when a whole server is locked.
+LOCKDOWN_MAX_CONCURRENCY = 8
+
+# Local mod-log archive (one JSONL file per UTC day, older days gzipped)
+MODLOG_ARCHIVE_DIR = "data/modlog_archive"
+MODLOG_ARCHIVE_FLUSH_SECONDS = 5       # batch window before buffered events hit disk
+MODLOG_ARCHIVE_FLUSH_MAX = 50          # flush early once this many events are buffered
+MODLOG_INDEX_PER_USER_MAX = 200        # newest N index entries kept per user
+MODLOG_INDEX_PER_DAY_MAX = 500         # newest N index entries kept per UTC day
+MODLOG_INDEX_RETENTION_DAYS = 90       # index covers this many days; older day files stay on disk
+MODLOG_INDEX_MAX_USERS = 2000          # least recently logged users drop out of the index past this
+
 # ── PUBLIC MESSAGES (flair) ────────────────────────────────────────
 TIMEOUT_PUBLIC_TEMPLATE = "🫖 Time-out tea is served, {member}. Back in {duration}."
 WARN_PUBLIC_TEMPLATE    = "🌹 Careful where you paint, {member}. Warning noted. {reason}"
@@ -86,6 +125,45 @@ def _save_warns(data: Dict[str, Any]) -> None:
         logging.exception("Failed to write warn DB")
 
 
+# ── UTILS: tiny JSON "DB" for lockdown snapshots ───────────────────
+def _load_lockdowns() -> Dict[str, Any]:
+    try:
+        with open(LOCKDOWN_DB_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logging.exception("Failed to read lockdown DB")
+        return {}
+
+
+def _save_lockdowns(data: Dict[str, Any]) -> None:
+    try:
+        import os
+        os.makedirs(os.path.dirname(LOCKDOWN_DB_PATH), exist_ok=True)
+        with open(LOCKDOWN_DB_PATH, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    except Exception:
+        logging.exception("Failed to write lockdown DB")
+
+
+def _snapshot_overwrite(overwrite: Optional[discord.PermissionOverwrite]) -> Optional[Dict[str, int]]:
+    """Serialise an overwrite as its raw allow/deny bitfields (None = no overwrite at all)."""
+    if overwrite is None:
+        return None
+    allow, deny = overwrite.pair()
+    return {"allow": allow.value, "deny": deny.value}
+
+
+def _restore_overwrite(snapshot: Optional[Dict[str, int]]) -> Optional[discord.PermissionOverwrite]:
+    if snapshot is None:
+        return None
+    return discord.PermissionOverwrite.from_pair(
+        discord.Permissions(int(snapshot.get("allow", 0))),
+        discord.Permissions(int(snapshot.get("deny", 0))),
+    )
+
+
 def _shorten(text: Optional[str], limit: int = 1024) -> str:
     if text is None:
         return ""
@@ -95,6 +173,119 @@ def _shorten(text: Optional[str], limit: int = 1024) -> str:
     return s[: limit - 3] + "..."
 
 
+# ── EDIT DIFF ──────────────────────────────────────────────────────
+_DIFF_TOKEN_RE = re.compile(r"\s+|\S+")
+
+
+def _diff_mark(tokens: List[str], marker: str) -> List[Tuple[str, str]]:
+    """
+    A token run as (marker, text) pieces: the non-whitespace core carries the
+    marker, surrounding whitespace stays plain so the markdown still renders.
+    """
+    text = "".join(tokens)
+    core = text.strip()
+    if not core:
+        return [("", text)]
+    lead = text[: len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()):]
+    return [("", lead), (marker, discord.utils.escape_markdown(core)), ("", trail)]
+
+
+def _fit_diff(pieces: List[Tuple[str, str]], limit: int) -> str:
+    """
+    Join (marker, text) pieces into at most `limit` characters. Cuts happen
+    between pieces, or inside one piece with its marker closed again, so a
+    long rewrite never leaves a dangling ** or ~~.
+    """
+    rendered = "".join(f"{m}{t}{m}" for m, t in pieces).strip()
+    if len(rendered) <= limit:
+        return rendered
+
+    budget = limit - 2  # room for " …"
+    out: List[str] = []
+    used = 0
+    for marker, text in pieces:
+        if not out:
+            text = text.lstrip()
+        size = len(text) + 2 * len(marker)
+        if used + size <= budget:
+            out.append(f"{marker}{text}{marker}")
+            used += size
+            continue
+        room = budget - used - 2 * len(marker)
+        # Don't end on a lone escape backslash or whitespace, or the closing marker breaks
+        cut = text[:max(room, 0)]
+        if " " in cut and len(cut) < len(text):
+            cut = cut.rsplit(" ", 1)[0]  # end on a word boundary
+        cut = cut.rstrip().rstrip("\\").rstrip()
+        if cut:
+            out.append(f"{marker}{cut}{marker}")
+        break
+    return "".join(out).rstrip() + " …"
+
+
+def _word_diff(before: str, after: str, limit: int = LOG_MESSAGE_CONTENT_MAX) -> str:
+    """
+    Render only what changed between two messages, word by word:
+    ~~removed~~ **added**, with a few words of context around each hunk.
+
+    The common prefix/suffix is trimmed in linear time first; only the
+    changed middle is aligned, and if that middle is larger than
+    EDIT_DIFF_ALIGN_MAX_TOKENS it is shown as a single replace hunk
+    instead of being aligned, so cost stays bounded for any input.
+    """
+    a = _DIFF_TOKEN_RE.findall(before)
+    b = _DIFF_TOKEN_RE.findall(after)
+
+    n = min(len(a), len(b))
+    pre = 0
+    while pre < n and a[pre] == b[pre]:
+        pre += 1
+    suf = 0
+    while suf < n - pre and a[len(a) - 1 - suf] == b[len(b) - 1 - suf]:
+        suf += 1
+
+    a_mid = a[pre:len(a) - suf]
+    b_mid = b[pre:len(b) - suf]
+    if len(a_mid) + len(b_mid) <= EDIT_DIFF_ALIGN_MAX_TOKENS:
+        mid_ops = SequenceMatcher(None, a_mid, b_mid, autojunk=False).get_opcodes()
+    else:
+        mid_ops = [("replace", 0, len(a_mid), 0, len(b_mid))]
+
+    ops = [("equal", 0, pre, 0, pre)]
+    ops += [(tag, i1 + pre, i2 + pre, j1 + pre, j2 + pre) for tag, i1, i2, j1, j2 in mid_ops]
+    ops.append(("equal", len(a) - suf, len(a), len(b) - suf, len(b)))
+
+    ctx = EDIT_DIFF_CONTEXT_WORDS * 2  # words + the whitespace between them
+    parts: List[Tuple[str, str]] = []
+    last = len(ops) - 1
+    for idx, (tag, i1, i2, j1, j2) in enumerate(ops):
+        if tag == "equal":
+            run = a[i1:i2]
+            if not run:
+                continue
+            head = run[:ctx] if idx > 0 else []
+            tail = run[-ctx:] if idx < last else []
+            if len(run) <= len(head) + len(tail):
+                parts.append(("", discord.utils.escape_markdown("".join(run))))
+                continue
+            if head:
+                parts.append(("", discord.utils.escape_markdown("".join(head))))
+            parts.append(("", " … "))
+            if tail:
+                parts.append(("", discord.utils.escape_markdown("".join(tail))))
+            continue
+
+        if i2 > i1:
+            parts.extend(_diff_mark(a[i1:i2], "~~"))
+        if j2 > j1:
+            if i2 > i1:
+                parts.append(("", " "))
+            parts.extend(_diff_mark(b[j1:j2], "**"))
+
+    return _fit_diff(parts, limit)
+
+
 # ── PERM CHECKS ────────────────────────────────────────────────────
 def is_mod():
     """Wrapper so existing decorators continue working, using shared permissions."""
@@ -106,9 +297,222 @@ def _is_immune(member: discord.Member) -> bool:
     return permissions.is_mod_member(member)
 
 
+# ── MOD LOG ARCHIVE (local JSONL + sidecar index) ──────────────────
+_ID_IN_FIELD_RE = re.compile(r"(\d{15,21})")
+
+
+def _embed_subject_id(embed: discord.Embed) -> Optional[int]:
+    """Pull the target user id out of a 'User' / 'Author' field, if present."""
+    for field in embed.fields:
+        if field.name in ("User", "Author") and field.value:
+            m = _ID_IN_FIELD_RE.search(field.value)
+            if m:
+                return int(m.group(1))
+    return None
+
+
+class ModlogArchive:
+    """
+    Append-only archive of every mod-log event.
+
+    - Events are buffered in memory and written in batches via a worker
+      thread, so the event loop never blocks on disk.
+    - One file per UTC day: modlog-YYYY-MM-DD.jsonl. Older days are
+      gzipped on rotation.
+    - index.json maps user id -> recent events (date, time, title), and
+      date -> events (including ones without a user) plus a count, so
+      searches never touch the JSONL files. It only covers the last
+      MODLOG_INDEX_RETENTION_DAYS and MODLOG_INDEX_MAX_USERS users, so it
+      stays small; it's serialised in the worker thread too.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._early_flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._current_day: Optional[str] = None
+        self._pruned_day: Optional[str] = None
+        self.index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    # -- index --------------------------------------------------------
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data.setdefault("users", {})
+                data.setdefault("dates", {})
+                data.setdefault("days", {})
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logging.exception("Failed to read modlog archive index")
+        return {"users": {}, "dates": {}, "days": {}}
+
+    def _index_record(self, rec: Dict[str, Any]) -> None:
+        day = rec["ts"][:10]
+        if day != self._pruned_day:
+            self._pruned_day = day
+            self._prune_index(day)
+        dates = self.index["dates"]
+        dates[day] = dates.get(day, 0) + 1
+
+        uid = rec.get("user_id")
+        by_day = self.index["days"].setdefault(day, [])
+        by_day.append({"ts": rec["ts"], "title": rec.get("title") or "", "user_id": uid})
+        if len(by_day) > MODLOG_INDEX_PER_DAY_MAX:
+            del by_day[: len(by_day) - MODLOG_INDEX_PER_DAY_MAX]
+
+        if uid is None:
+            return
+        users = self.index["users"]
+        entries = users.pop(str(uid), [])
+        users[str(uid)] = entries  # re-insert: dict order doubles as least-recently-logged order
+        entries.append({"ts": rec["ts"], "title": rec.get("title") or ""})
+        if len(entries) > MODLOG_INDEX_PER_USER_MAX:
+            del entries[: len(entries) - MODLOG_INDEX_PER_USER_MAX]
+        while len(users) > MODLOG_INDEX_MAX_USERS:
+            del users[next(iter(users))]
+
+    def _prune_index(self, today: str) -> None:
+        """Drop index entries older than the retention window (runs once per UTC day)."""
+        cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=MODLOG_INDEX_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        for key in ("dates", "days"):
+            table = self.index[key]
+            for day in [d for d in table if d < cutoff]:
+                del table[day]
+        users = self.index["users"]
+        for uid in list(users):
+            kept = [e for e in users[uid] if e["ts"][:10] >= cutoff]
+            if kept:
+                users[uid] = kept
+            else:
+                del users[uid]
+
+    def search(
+        self,
+        user_id: Optional[int] = None,
+        day: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Newest-first index entries matching user and/or day (YYYY-MM-DD)."""
+        if user_id is not None:
+            entries = self.index["users"].get(str(user_id), [])
+            if day:
+                entries = [e for e in entries if e["ts"].startswith(day)]
+            return [dict(e, user_id=user_id) for e in reversed(entries[-limit:])]
+
+        if not day:
+            return []
+
+        # Date-only search: straight from the per-day list (includes events without a user)
+        entries = self.index["days"].get(day, [])
+        return [dict(e) for e in reversed(entries[-limit:])]
+
+    def day_count(self, day: str) -> int:
+        return int(self.index["dates"].get(day, 0))
+
+    # -- writes -------------------------------------------------------
+    def add(self, guild: discord.Guild, embed: discord.Embed, user_id: Optional[int]) -> None:
+        rec = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "guild_id": guild.id,
+            "user_id": user_id if user_id is not None else _embed_subject_id(embed),
+            "title": embed.title,
+            "embed": embed.to_dict(),
+        }
+        self._buffer.append(rec)
+        self._index_record(rec)
+
+        if len(self._buffer) >= MODLOG_ARCHIVE_FLUSH_MAX:
+            if self._early_flush_task is None or self._early_flush_task.done():
+                # Keep a reference: the loop only holds tasks weakly
+                self._early_flush_task = asyncio.get_running_loop().create_task(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(MODLOG_ARCHIVE_FLUSH_SECONDS)
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self._write_lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            # Entries are never mutated once recorded, so copying the lists is a
+            # consistent snapshot; json.dumps itself runs in the worker thread.
+            index_snapshot = {
+                "users": {uid: list(entries) for uid, entries in self.index["users"].items()},
+                "dates": dict(self.index["dates"]),
+                "days": {day: list(entries) for day, entries in self.index["days"].items()},
+            }
+            try:
+                await asyncio.to_thread(self._write_batch, batch, index_snapshot)
+            except Exception:
+                logging.exception("Failed to write modlog archive batch")
+
+    def _write_batch(self, batch: List[Dict[str, Any]], index: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        by_day: Dict[str, List[str]] = {}
+        for rec in batch:
+            by_day.setdefault(rec["ts"][:10], []).append(json.dumps(rec, ensure_ascii=False))
+
+        for day, lines in by_day.items():
+            path = os.path.join(self.directory, f"modlog-{day}.jsonl")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+        newest = max(by_day)
+        if newest != self._current_day:
+            self._current_day = newest
+            self._rotate(keep=newest)
+
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+
+    def _rotate(self, keep: str) -> None:
+        """Gzip every plain day file except the current one."""
+        for name in os.listdir(self.directory):
+            if not (name.startswith("modlog-") and name.endswith(".jsonl")):
+                continue
+            if name == f"modlog-{keep}.jsonl":
+                continue
+            src = os.path.join(self.directory, name)
+            try:
+                with open(src, "rb") as fin, gzip.open(src + ".gz", "ab") as fout:
+                    shutil.copyfileobj(fin, fout)
+                os.remove(src)
+            except Exception:
+                logging.exception("Failed to rotate modlog archive file %s", name)
+
+
+MODLOG_ARCHIVE = ModlogArchive(MODLOG_ARCHIVE_DIR)
+
+
 # ── MOD LOG HELPER ─────────────────────────────────────────────────
-async def modlog(guild: discord.Guild, embed: discord.Embed):
-    """Send an embed to the configured mod-log channel, if any."""
+async def modlog(
+    guild: discord.Guild,
+    embed: discord.Embed,
+    user_id: Optional[int] = None,
+):
+    """
+    Archive the event locally, then send the embed to the configured
+    mod-log channel, if any. `user_id` overrides the id parsed from the
+    embed's User/Author field for the archive index.
+    """
+    try:
+        MODLOG_ARCHIVE.add(guild, embed, user_id)
+    except Exception:
+        logging.exception("Failed to archive modlog event")
+
     if config.MODLOG_CHANNEL_ID is None:
         return
     ch = guild.get_channel(config.MODLOG_CHANNEL_ID)
@@ -152,12 +556,72 @@ class BurstTracker:
         return filtered
 
 
+class AttachmentTracker:
+    """
+    Time-windowed counter of attachment fingerprints.
+
+    Each fingerprint keeps a bounded deque of (ts, user_id) in arrival
+    order, so expiring old hits is a popleft and adding one is an append.
+    A fingerprint is reported at most once per window (see mark_flagged).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.hits: Dict[str, Deque[tuple[int, int]]] = {}
+        self.flagged: Dict[str, int] = {}  # fingerprint -> ts it was last reported
+        self._last_sweep = 0
+
+    def add(self, fingerprint: str, user_id: int, ts: int) -> tuple[int, int]:
+        """Record a hit; return (distinct users, hits by this user) within the window."""
+        bucket = self.hits.get(fingerprint)
+        if bucket is None:
+            bucket = self.hits[fingerprint] = deque(maxlen=ATTACHMENT_BUCKET_MAX)
+        while bucket and ts - bucket[0][0] > self.window:
+            bucket.popleft()
+        bucket.append((ts, user_id))
+
+        # Buckets hold at most ATTACHMENT_BUCKET_MAX hits, so these counts stay tiny.
+        users = {u for (_, u) in bucket}
+        mine = sum(1 for (_, u) in bucket if u == user_id)
+
+        # Occasionally drop fingerprints nobody has posted recently
+        if ts - self._last_sweep > self.window:
+            self._last_sweep = ts
+            stale = [fp for fp, b in self.hits.items() if not b or ts - b[-1][0] > self.window]
+            for fp in stale:
+                del self.hits[fp]
+            expired = [fp for fp, at in self.flagged.items() if ts - at > self.window]
+            for fp in expired:
+                del self.flagged[fp]
+
+        return len(users), mine
+
+    def mark_flagged(self, fingerprint: str, ts: int) -> bool:
+        """Remember a report; False if this fingerprint was already reported within the window."""
+        last = self.flagged.get(fingerprint)
+        if last is not None and ts - last <= self.window:
+            return False
+        self.flagged[fingerprint] = ts
+        return True
+
+
 class Moderation(commands.Cog):
     """Moderation commands, AutoMod, and enhanced message logs."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.burst_tracker = BurstTracker()
+        self.attachment_tracker = AttachmentTracker(ATTACHMENT_WINDOW_SECONDS)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def cog_load(self):
+        self.session = aiohttp.ClientSession()
+
+    async def cog_unload(self):
+        # Don't lose buffered archive events on reload / shutdown
+        await MODLOG_ARCHIVE.flush()
+        if self.session and not self.session.closed:
+            await self.session.close()
 
     # ── helpers (audit-log based) ──────────────────────────────────
 
@@ -265,6 +729,9 @@ class Moderation(commands.Cog):
         if ANTISPAM_ENABLED or REPEAT_ENABLED:
             await self._check_spam_and_repeats(message)
 
+        if ATTACHMENT_SPAM_ENABLED and message.attachments:
+            await self._check_attachment_spam(message)
+
     async def _check_spam_and_repeats(self, message: discord.Message):
         if not isinstance(message.author, discord.Member):
             return
@@ -308,6 +775,75 @@ class Moderation(commands.Cog):
                 except Exception:
                     logging.exception("Error while handling repeat spam (modlog)")
 
+    async def _fetch_attachment_head(self, attachment: discord.Attachment) -> bytes:
+        """Ranged GET of the first few bytes of an attachment (best effort)."""
+        if not self.session:
+            return b""
+        try:
+            async with self.session.get(
+                attachment.url,
+                headers={"Range": f"bytes=0-{ATTACHMENT_HEAD_BYTES - 1}"},
+                timeout=aiohttp.ClientTimeout(total=ATTACHMENT_FETCH_TIMEOUT),
+            ) as resp:
+                if resp.status not in (200, 206):
+                    return b""
+                # Servers that ignore Range still only get read this far
+                return await resp.content.read(ATTACHMENT_HEAD_BYTES)
+        except Exception:
+            return b""
+
+    async def _attachment_fingerprint(self, attachment: discord.Attachment) -> str:
+        """
+        Cheap identity for a file: size + content type + dimensions, plus a
+        hash of its first bytes when the ranged fetch succeeds.
+        """
+        meta = f"{attachment.size}|{attachment.content_type or ''}|{attachment.width}x{attachment.height}"
+        head = await self._fetch_attachment_head(attachment)
+        if not head:
+            return meta
+        return meta + "|" + hashlib.blake2b(head, digest_size=12).hexdigest()
+
+    async def _check_attachment_spam(self, message: discord.Message):
+        if not isinstance(message.author, discord.Member):
+            return
+
+        now_ts = int(message.created_at.timestamp())
+        flagged: Optional[str] = None
+        flagged_fp = ""
+
+        attachments = message.attachments[:ATTACHMENT_MAX_PER_MESSAGE]
+        fingerprints = await asyncio.gather(*(self._attachment_fingerprint(a) for a in attachments))
+
+        for attachment, fp in zip(attachments, fingerprints):
+            users, mine = self.attachment_tracker.add(fp, message.author.id, now_ts)
+            if users >= ATTACHMENT_MAX_USERS:
+                flagged = f"Same file posted by {users} users ({attachment.filename})"
+            elif mine >= ATTACHMENT_MAX_PER_USER:
+                flagged = f"Same file posted {mine}× ({attachment.filename})"
+            if flagged:
+                flagged_fp = fp
+                break
+
+        if not flagged:
+            return
+        first_report = self.attachment_tracker.mark_flagged(flagged_fp, now_ts)
+        if not first_report and not ATTACHMENT_SPAM_DELETE:
+            return  # already in the mod log for this window
+
+        try:
+            if ATTACHMENT_SPAM_DELETE:
+                await message.delete()
+            if not first_report:
+                return
+            await modlog(
+                message.guild,
+                action_embed(message.author, self.bot.user, "Attachment spam", flagged),
+            )
+        except discord.Forbidden:
+            logging.warning("Moderation: missing permission to delete attachment spam")
+        except Exception:
+            logging.exception("Error while handling attachment spam")
+
     # ── MESSAGE LOGGING (delete / edit, Mittens-style) ─────────────
     @commands.Cog.listener()
     async def on_message_delete(self, message: discord.Message):
@@ -416,15 +952,10 @@ class Moderation(commands.Cog):
         if isinstance(after.channel, discord.Thread) and after.channel.parent_id == config.MODLOG_CHANNEL_ID:
             return
 
-        before_text = before.content or "*no content*"
-        after_text = after.content or "*no content*"
-
-        before_snip = _shorten(before_text, 900)
-        after_snip = _shorten(after_text, 900)
-
-        desc = (
-            f"**Before:**\n```{before_snip}```\n"
-            f"**After:**\n```{after_snip}```"
+        desc = "**Changes:**\n" + _word_diff(
+            before.content or "",
+            after.content or "",
+            LOG_MESSAGE_CONTENT_MAX,
         )
 
         embed = discord.Embed(
@@ -655,6 +1186,255 @@ class Moderation(commands.Cog):
                 ephemeral=True,
             )
 
+    # ── LOCKDOWN (category / whole server) ─────────────────────────
+    @staticmethod
+    def _lockdown_targets(
+        guild: discord.Guild,
+        category: Optional[discord.CategoryChannel],
+    ) -> List[discord.abc.GuildChannel]:
+        source = category.channels if category is not None else guild.channels
+        return [ch for ch in source if not isinstance(ch, discord.CategoryChannel)]
+
+    async def _apply_overwrites(
+        self,
+        everyone: discord.Role,
+        changes: List[tuple[discord.abc.GuildChannel, Optional[discord.PermissionOverwrite]]],
+        reason: str,
+    ) -> tuple[List[int], List[int]]:
+        """
+        Apply @everyone overwrites to many channels concurrently (bounded).
+        Returns (ok_channel_ids, failed_channel_ids).
+        """
+        sem = asyncio.Semaphore(LOCKDOWN_MAX_CONCURRENCY)
+
+        async def _one(ch: discord.abc.GuildChannel, ow: Optional[discord.PermissionOverwrite]) -> bool:
+            async with sem:
+                try:
+                    await ch.set_permissions(everyone, overwrite=ow, reason=reason)
+                    return True
+                except discord.Forbidden:
+                    logging.warning("Moderation: missing permission to edit overwrites in #%s", ch)
+                except Exception:
+                    logging.exception("Error while editing overwrites in #%s", ch)
+                return False
+
+        results = await asyncio.gather(*(_one(ch, ow) for ch, ow in changes))
+        ok = [ch.id for (ch, _), good in zip(changes, results) if good]
+        failed = [ch.id for (ch, _), good in zip(changes, results) if not good]
+        return ok, failed
+
+    @app_commands.command(
+        name="lockdown",
+        description="Lock a whole category (or the entire server) for @everyone.",
+    )
+    @is_mod()
+    @app_commands.describe(
+        category="Only lock channels in this category. Leave empty for the whole server.",
+        reason="Reason shown in the audit log.",
+    )
+    async def lockdown_cmd(
+        self,
+        interaction: discord.Interaction,
+        category: Optional[discord.CategoryChannel] = None,
+        reason: Optional[str] = None,
+    ):
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message(
+                "This command can only be used in a server.",
+                ephemeral=True,
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        everyone = guild.default_role
+        targets = self._lockdown_targets(guild, category)
+
+        # Snapshot first, and persist before touching anything, so a crash
+        # mid-lockdown can still be undone. Channels already in an active
+        # lockdown keep their ORIGINAL snapshot (not the locked one).
+        data = _load_lockdowns()
+        saved: Dict[str, Any] = data.setdefault(str(guild.id), {})
+        for ch in targets:
+            key = str(ch.id)
+            if key not in saved:
+                saved[key] = _snapshot_overwrite(ch.overwrites.get(everyone))
+        _save_lockdowns(data)
+
+        changes: List[tuple[discord.abc.GuildChannel, Optional[discord.PermissionOverwrite]]] = []
+        for ch in targets:
+            perms = ch.overwrites_for(everyone)
+            perms.send_messages = False
+            perms.send_messages_in_threads = False
+            perms.create_public_threads = False
+            changes.append((ch, perms))
+
+        audit_reason = f"Lockdown by {interaction.user}: {reason or 'no reason'}"
+        ok, failed = await self._apply_overwrites(everyone, changes, audit_reason)
+
+        scope = f"category **{category.name}**" if category else "the whole server"
+        msg = f"🔒 Locked {len(ok)} channel(s) in {scope}."
+        if failed:
+            msg += f" {len(failed)} channel(s) could not be locked (missing permissions?)."
+        await interaction.followup.send(msg, ephemeral=True)
+
+        await modlog(
+            guild,
+            action_embed(
+                interaction.user,
+                interaction.user,
+                "Lockdown",
+                f"{scope.replace('**', '')}: {len(ok)} locked, {len(failed)} failed. {reason or ''}".strip(),
+            ),
+        )
+
+    @app_commands.command(
+        name="unlockdown",
+        description="Restore channel permissions saved by /lockdown.",
+    )
+    @is_mod()
+    @app_commands.describe(
+        category="Only restore channels in this category. Leave empty to restore everything.",
+    )
+    async def unlockdown_cmd(
+        self,
+        interaction: discord.Interaction,
+        category: Optional[discord.CategoryChannel] = None,
+    ):
+        guild = interaction.guild
+        if guild is None:
+            await interaction.response.send_message(
+                "This command can only be used in a server.",
+                ephemeral=True,
+            )
+            return
+
+        data = _load_lockdowns()
+        saved: Dict[str, Any] = data.get(str(guild.id), {})
+        if not saved:
+            await interaction.response.send_message(
+                "There is no active lockdown to undo.",
+                ephemeral=True,
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        everyone = guild.default_role
+        wanted = {ch.id for ch in self._lockdown_targets(guild, category)} if category else None
+
+        changes: List[tuple[discord.abc.GuildChannel, Optional[discord.PermissionOverwrite]]] = []
+        gone: List[str] = []
+        for key, snap in saved.items():
+            ch_id = int(key)
+            if wanted is not None and ch_id not in wanted:
+                continue
+            ch = guild.get_channel(ch_id)
+            if ch is None:
+                gone.append(key)  # channel deleted since; nothing to restore
+                continue
+            changes.append((ch, _restore_overwrite(snap)))
+
+        ok, failed = await self._apply_overwrites(
+            everyone,
+            changes,
+            f"Lockdown lifted by {interaction.user}",
+        )
+
+        # Only forget snapshots we actually restored; failures stay for a retry.
+        for key in gone + [str(i) for i in ok]:
+            saved.pop(key, None)
+        if not saved:
+            data.pop(str(guild.id), None)
+        _save_lockdowns(data)
+
+        msg = f"🔓 Restored {len(ok)} channel(s) to their previous permissions."
+        if failed:
+            msg += f" {len(failed)} channel(s) failed; run /unlockdown again to retry."
+        await interaction.followup.send(msg, ephemeral=True)
+
+        await modlog(
+            guild,
+            action_embed(
+                interaction.user,
+                interaction.user,
+                "Lockdown lifted",
+                f"{len(ok)} restored, {len(failed)} failed.",
+            ),
+        )
+
+    # ── MOD LOG SEARCH (local archive index) ───────────────────────
+    @app_commands.command(
+        name="modlog_search",
+        description="Search the local mod-log archive by user and/or date.",
+    )
+    @is_mod()
+    @app_commands.describe(
+        user="Only show events about this user.",
+        date="Only show events from this UTC day (YYYY-MM-DD).",
+        limit="How many entries to show (max 50).",
+    )
+    async def modlog_search_cmd(
+        self,
+        interaction: discord.Interaction,
+        user: Optional[discord.User] = None,
+        date: Optional[str] = None,
+        limit: app_commands.Range[int, 1, 50] = 20,
+    ):
+        if user is None and not date:
+            await interaction.response.send_message(
+                "Give me a user, a date, or both.",
+                ephemeral=True,
+            )
+            return
+
+        day = date.strip() if date else None
+        if day:
+            try:
+                datetime.strptime(day, "%Y-%m-%d")
+            except ValueError:
+                await interaction.response.send_message(
+                    "Date must look like `2025-01-31`.",
+                    ephemeral=True,
+                )
+                return
+
+        hits = MODLOG_ARCHIVE.search(
+            user_id=user.id if user else None,
+            day=day,
+            limit=limit,
+        )
+
+        if not hits:
+            await interaction.response.send_message(
+                "No archived mod-log events match that.",
+                ephemeral=True,
+            )
+            return
+
+        lines: List[str] = []
+        for e in hits:
+            when = e["ts"].replace("T", " ")[:16]
+            who = f" – <@{e['user_id']}>" if user is None and e.get("user_id") else ""
+            lines.append(f"`{when}` **{e.get('title') or 'Event'}**{who}")
+
+        title = "Mod-log archive"
+        if user is not None:
+            title += f" · {user}"
+        if day:
+            title += f" · {day}"
+
+        embed = discord.Embed(
+            title=title,
+            description=_shorten("\n".join(lines), 4000),
+            color=discord.Color.blurple(),
+        )
+        if day:
+            embed.set_footer(text=f"{MODLOG_ARCHIVE.day_count(day)} event(s) archived that day")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     # ── MEMBER DISCIPLINE (quick timeout via slash) ────────────────
     async def _quick_timeout_callback(
         self,
@@ -4,18 +4,28 @@ from __future__ import annotations
 import asyncio
 import base64
 import binascii
+import io
+import json
 import logging
 import os
+import random
 import re
+import threading
+import time
 import urllib.parse
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Optional
+from itertools import islice
+from typing import Awaitable, Callable, Optional
 
 import aiohttp
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 import yt_dlp
 
+import permissions
+
 LOG = logging.getLogger(__name__)
 
 # ── CONFIG ─────────────────────────────────────────────────────────
@@ -23,13 +33,21 @@ MUSIC_TEXT_CHANNEL_ID = 1441863803011727380
 EMBED_COLOR = 0x5865F2
 FFMPEG_BEFORE_OPTIONS = "-nostdin -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
 FFMPEG_OPTIONS = "-vn"
+# discord.py reads one 20 ms frame per packet, so packets played = elapsed audio
+FRAME_SECONDS = 0.02
+SEEK_RE = re.compile(r"^([+-])?(?:(\d+):)?(?:(\d+):)?(\d+(?:\.\d+)?)$")
+
+# Opus passthrough: YouTube serves Opus audio, which Discord speaks natively.
+# Copying it skips the decode → PCM → re-encode round trip in-process.
+OPUS_PASSTHROUGH = True
+OPUS_PROBE_UNKNOWN = True                # ffprobe streams whose codec yt-dlp didn't report
 
 YTDLP_COOKIES_ENV = os.getenv("YTDLP_COOKIES", "").strip()
 YTDLP_COOKIES_B64_ENV = os.getenv("YTDLP_COOKIES_B64", "").strip()
 AUTO_COOKIE_PATH = "/app/data/cookies.txt"
 
 YTDL_BASE_OPTS = {
-    "format": "bestaudio/best",
+    "format": "bestaudio[acodec=opus]/bestaudio/best",
     "quiet": True,
     "no_warnings": True,
     "noplaylist": False,
@@ -58,8 +76,739 @@ SPOTIFY_HOSTS = (
     "play.spotify.com",
     "spotify.link",
 )
-SPOTIFY_TRACK_RE = re.compile(r"spotify\.com/track/([A-Za-z0-9]+)", re.IGNORECASE)
+SPOTIFY_LINK_RE = re.compile(
+    r"spotify\.com/(?:intl-[A-Za-z-]+/)?(track|album|playlist)/([A-Za-z0-9]+)",
+    re.IGNORECASE,
+)
+SPOTIFY_NEXT_DATA_RE = re.compile(
+    r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
 URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+YOUTUBE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+# Extraction cache (single videos only, keyed by YouTube video id)
+EXTRACT_CACHE_MAX_ENTRIES = 256
+EXTRACT_CACHE_DEFAULT_TTL = 30 * 60      # used when the stream URL has no expire=
+EXTRACT_CACHE_MAX_TTL = 6 * 60 * 60
+EXTRACT_CACHE_EXPIRE_MARGIN = 10 * 60    # treat URLs as stale this long before they expire
+
+# Spotify albums / playlists
+SPOTIFY_MAX_TRACKS = 100                 # tracks taken from one album/playlist link
+SPOTIFY_SEARCH_CONCURRENCY = 4           # YouTube searches in flight at once
+SPOTIFY_MAP_PATH = os.getenv("SPOTIFY_MAP_PATH", "data/spotify_youtube_map.json")
+SPOTIFY_MAP_MAX_ENTRIES = 5000
+
+# Optional on-disk Opus cache for tracks this server replays a lot
+AUDIO_CACHE_ENABLED = os.getenv("MUSIC_AUDIO_CACHE", "").strip().lower() in ("1", "true", "yes")
+AUDIO_CACHE_DIR = os.getenv("MUSIC_AUDIO_CACHE_DIR", "data/audio_cache")
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("MUSIC_AUDIO_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+AUDIO_CACHE_MIN_PLAYS = int(os.getenv("MUSIC_AUDIO_CACHE_MIN_PLAYS", "3"))  # cache once played more than this
+AUDIO_CACHE_MAX_DURATION = 15 * 60       # don't cache hour-long mixes
+AUDIO_CACHE_MAX_TRACKED = 5000           # play counters kept for uncached tracks
+
+# Prefetch / gapless transitions
+PREFETCH_PROBE_TIMEOUT = 5               # seconds for the ranged probe of the next stream URL
+
+# /play autocomplete (YouTube search suggestions)
+AUTOCOMPLETE_MIN_CHARS = 3
+AUTOCOMPLETE_DEBOUNCE = 0.35             # wait this long for the next keystroke before searching
+AUTOCOMPLETE_BUDGET = 2.0                # Discord drops autocomplete answers after ~3s
+AUTOCOMPLETE_RESULTS = 5
+AUTOCOMPLETE_CACHE_TTL = 10 * 60
+AUTOCOMPLETE_CACHE_MAX = 512
+
+# Latency histogram buckets (seconds)
+METRIC_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 20, 30, 60)
+
+# Stream URL expiry
+STREAM_URL_REFRESH_MARGIN = 5 * 60       # re-extract if the URL dies within track length + this
+EARLY_END_SLACK = 10                     # a track ending this much before its duration "died"
+STREAM_RETRY_LIMIT = 1                   # mid-stream re-extract attempts per track
+
+QUEUE_PAGE_SIZE = 10
+QUEUE_VIEW_TIMEOUT = 180
+
+# Persisted queues (survive restarts / reloads)
+#   On hosts with a mounted volume, set e.g.:
+#   MUSIC_STATE_PATH=/data/music_queues.json
+MUSIC_STATE_PATH = os.getenv("MUSIC_STATE_PATH", "data/music_queues.json")
+PERSIST_DEBOUNCE_SECONDS = 5             # queue edits within this window share one write
+PERSIST_POSITION_SECONDS = 30            # how often the playing position is re-saved
+RESUME_OFFER_TIMEOUT = 15 * 60
+
+# Leave voice after this long with nobody listening or nothing left to play
+IDLE_DISCONNECT_SECONDS = int(os.getenv("MUSIC_IDLE_DISCONNECT_SECONDS", "300"))
+PERSISTED_ITEM_FIELDS = ("title", "webpage_url", "requested_by", "duration", "thumbnail", "requester_id")
+
+
+def youtube_video_id(url: str) -> Optional[str]:
+    """Normalise a single-video YouTube URL to its 11-char id (None for playlists/other)."""
+    try:
+        parsed = urllib.parse.urlparse(url)
+    except Exception:
+        return None
+
+    host = parsed.netloc.lower()
+    query = urllib.parse.parse_qs(parsed.query)
+    if "list" in query:
+        return None  # playlist links extract differently; don't cache them as one video
+
+    candidate: Optional[str] = None
+    if host == "youtu.be" or host.endswith(".youtu.be"):
+        candidate = parsed.path.lstrip("/").split("/", 1)[0]
+    elif any(host == h or host.endswith(f".{h}") for h in YOUTUBE_HOSTS):
+        if parsed.path == "/watch":
+            candidate = (query.get("v") or [""])[0]
+        else:
+            parts = [p for p in parsed.path.split("/") if p]
+            if len(parts) >= 2 and parts[0] in ("shorts", "live", "embed", "v"):
+                candidate = parts[1]
+
+    if candidate and YOUTUBE_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def stream_url_expiry(stream_url: str) -> Optional[float]:
+    """Unix time at which a googlevideo stream URL stops working, if it says."""
+    try:
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(stream_url).query)
+        return float(query["expire"][0])
+    except (KeyError, IndexError, ValueError):
+        pass
+    # Some formats carry it as a path segment: /expire/1700000000/
+    match = re.search(r"/expire/(\d+)", stream_url or "")
+    return float(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class SpotifyTrack:
+    id: str
+    title: str
+    artists: str = ""
+
+    @property
+    def search_query(self) -> str:
+        return f"{self.title} {self.artists} audio".replace("  ", " ").strip()
+
+
+def _spotify_id_from_uri(uri: str) -> str:
+    # "spotify:track:4uLU6hMCjMI75M1A2tKUQC" -> "4uLU6hMCjMI75M1A2tKUQC"
+    return uri.rsplit(":", 1)[-1] if uri else ""
+
+
+def parse_spotify_embed(html: str) -> list[SpotifyTrack]:
+    """
+    Track list from an open.spotify.com/embed/... page. The page carries its
+    data as JSON in a __NEXT_DATA__ script; the raw JSON is accepted too.
+    """
+    match = SPOTIFY_NEXT_DATA_RE.search(html)
+    try:
+        data = json.loads(match.group(1) if match else html)
+    except (ValueError, TypeError):
+        return []
+
+    entity: dict = {}
+    try:
+        entity = data["props"]["pageProps"]["state"]["data"]["entity"]
+    except (KeyError, TypeError):
+        entity = data.get("entity", {}) if isinstance(data, dict) else {}
+    if not isinstance(entity, dict):
+        return []
+
+    tracks: list[SpotifyTrack] = []
+    track_list = entity.get("trackList")
+    if isinstance(track_list, list):
+        for entry in track_list:
+            if not isinstance(entry, dict):
+                continue
+            track_id = _spotify_id_from_uri(entry.get("uri") or "")
+            title = entry.get("title") or entry.get("name")
+            if track_id and title:
+                tracks.append(SpotifyTrack(track_id, str(title), str(entry.get("subtitle") or "")))
+        return tracks
+
+    # Single-track embed
+    title = entity.get("title") or entity.get("name")
+    track_id = entity.get("id") or _spotify_id_from_uri(entity.get("uri") or "")
+    if title and track_id:
+        artists = entity.get("artists") or []
+        names = ", ".join(a.get("name", "") for a in artists if isinstance(a, dict))
+        tracks.append(SpotifyTrack(str(track_id), str(title), names or str(entity.get("subtitle") or "")))
+    return tracks
+
+
+def parse_spotify_og(html: str, track_id: str) -> list[SpotifyTrack]:
+    """Fallback for track pages: og:title / og:description meta tags."""
+    title_match = re.search(r'<meta\s+property="og:title"\s+content="([^"]+)"', html, re.IGNORECASE)
+    desc_match = re.search(r'<meta\s+property="og:description"\s+content="([^"]+)"', html, re.IGNORECASE)
+    title = html_unescape(title_match.group(1).strip()) if title_match else ""
+    desc = html_unescape(desc_match.group(1).strip()) if desc_match else ""
+    if not title:
+        return []
+    artists = desc if desc and desc.lower() not in title.lower() else ""
+    return [SpotifyTrack(track_id, title, artists)]
+
+
+class SpotifyMapCache:
+    """Persistent Spotify track id -> YouTube match ({id, title, duration})."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries: OrderedDict[str, dict] = OrderedDict()
+        self._save_task: Optional[asyncio.Task] = None
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            LOG.exception("Music: failed to read %s", self.path)
+            return
+        if isinstance(data, dict):
+            self.entries = OrderedDict((k, v) for k, v in data.items() if isinstance(v, dict))
+
+    def get(self, spotify_id: str) -> Optional[dict]:
+        return self.entries.get(spotify_id)
+
+    def put(self, spotify_id: str, match: dict) -> None:
+        self.entries[spotify_id] = match
+        self.entries.move_to_end(spotify_id)
+        while len(self.entries) > SPOTIFY_MAP_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save_soon())
+
+    async def _save_soon(self) -> None:
+        await asyncio.sleep(PERSIST_DEBOUNCE_SECONDS)
+        await asyncio.to_thread(self.save, dict(self.entries))
+
+    def save(self, entries: Optional[dict] = None) -> None:
+        try:
+            parent = os.path.dirname(self.path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries if entries is not None else dict(self.entries), f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            LOG.exception("Music: failed to write %s", self.path)
+
+
+class SpotifyResolver:
+    """
+    Spotify link -> list of YouTube matches.
+
+    Network access goes through the two injected callables, so the parsing
+    and matching can be driven from local HTML/JSON files:
+      fetch_text(url) -> page text (or None)
+      search(query)   -> {"id", "title", "duration"} of the best YouTube hit (or None)
+    """
+
+    def __init__(
+        self,
+        fetch_text: Callable[[str], Awaitable[Optional[str]]],
+        search: Callable[[str], Awaitable[Optional[dict]]],
+        mapping: SpotifyMapCache,
+    ) -> None:
+        self.fetch_text = fetch_text
+        self.search = search
+        self.mapping = mapping
+
+    async def tracks(self, url: str) -> list[SpotifyTrack]:
+        match = SPOTIFY_LINK_RE.search(url)
+        if not match:
+            return []
+        kind, spotify_id = match.group(1).lower(), match.group(2)
+
+        html = await self.fetch_text(f"https://open.spotify.com/embed/{kind}/{spotify_id}")
+        tracks = parse_spotify_embed(html) if html else []
+        if not tracks and kind == "track":
+            page = await self.fetch_text(f"https://open.spotify.com/track/{spotify_id}")
+            tracks = parse_spotify_og(page, spotify_id) if page else []
+        return tracks[:SPOTIFY_MAX_TRACKS]
+
+    async def match(self, track: SpotifyTrack) -> Optional[dict]:
+        cached = self.mapping.get(track.id)
+        if cached:
+            return cached
+        found = await self.search(track.search_query)
+        if found and found.get("id"):
+            self.mapping.put(track.id, found)
+        return found
+
+    async def match_all(self, tracks: list[SpotifyTrack]) -> list[tuple[SpotifyTrack, Optional[dict]]]:
+        """Resolve every track concurrently (bounded), keeping the original order."""
+        sem = asyncio.Semaphore(SPOTIFY_SEARCH_CONCURRENCY)
+
+        async def _one(track: SpotifyTrack) -> Optional[dict]:
+            async with sem:
+                try:
+                    return await self.match(track)
+                except Exception:
+                    LOG.warning("Music: no YouTube match for Spotify track %s", track.id)
+                    return None
+
+        results = await asyncio.gather(*(_one(t) for t in tracks))
+        return list(zip(tracks, results))
+
+
+class AudioCache:
+    """
+    On-disk Opus files for frequently played YouTube tracks.
+
+    Every play bumps a counter; once a track has been played more than
+    AUDIO_CACHE_MIN_PLAYS times, one background worker copies its audio to
+    <video id>.ogg with ffmpeg at the lowest CPU priority. When the byte
+    budget is exceeded, the least-played files go first (oldest play
+    breaks ties).
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        # video id -> {"plays": int, "last": float, "bytes": int (0 = not cached)}
+        self.entries: dict[str, dict] = {}
+        self._fill_queue: asyncio.Queue[tuple[str, str, Optional[str]]] = asyncio.Queue()
+        self._filling: set[str] = set()
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+        except FileNotFoundError:
+            pass
+        except Exception:
+            LOG.exception("Music: failed to read audio cache index")
+
+        # Forget files that vanished from disk
+        for video_id, entry in self.entries.items():
+            if entry.get("bytes") and not os.path.exists(self.path_for(video_id)):
+                entry["bytes"] = 0
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._fill_worker())
+
+    def stop(self) -> None:
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+        self.save_index()
+
+    def path_for(self, video_id: str) -> str:
+        return os.path.join(self.directory, f"{video_id}.ogg")
+
+    def lookup(self, item: QueueItem) -> Optional[str]:
+        video_id = youtube_video_id(item.webpage_url)
+        entry = self.entries.get(video_id or "")
+        if entry and entry.get("bytes"):
+            path = self.path_for(video_id)
+            if os.path.exists(path):
+                return path
+            entry["bytes"] = 0
+        return None
+
+    def used_bytes(self) -> int:
+        return sum(int(e.get("bytes") or 0) for e in self.entries.values())
+
+    def record_play(self, item: QueueItem) -> None:
+        video_id = youtube_video_id(item.webpage_url)
+        if not video_id:
+            return
+        entry = self.entries.setdefault(video_id, {"plays": 0, "last": 0.0, "bytes": 0})
+        entry["plays"] = int(entry.get("plays") or 0) + 1
+        entry["last"] = time.time()
+
+        if (
+            not entry.get("bytes")
+            and entry["plays"] > AUDIO_CACHE_MIN_PLAYS
+            and item.stream_url
+            and (item.duration or 0) <= AUDIO_CACHE_MAX_DURATION
+            and video_id not in self._filling
+        ):
+            self._filling.add(video_id)
+            self._fill_queue.put_nowait((video_id, item.stream_url, item.acodec))
+
+        if len(self.entries) > AUDIO_CACHE_MAX_TRACKED:
+            uncached = sorted(
+                (k for k, e in self.entries.items() if not e.get("bytes")),
+                key=lambda k: (self.entries[k].get("plays", 0), self.entries[k].get("last", 0)),
+            )
+            for key in uncached[: len(self.entries) - AUDIO_CACHE_MAX_TRACKED]:
+                del self.entries[key]
+
+    async def _fill_worker(self) -> None:
+        while True:
+            video_id, stream_url, acodec = await self._fill_queue.get()
+            try:
+                await self._fill(video_id, stream_url, acodec)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                LOG.exception("Music: audio cache fill failed for %s", video_id)
+            finally:
+                self._filling.discard(video_id)
+
+    async def _fill(self, video_id: str, stream_url: str, acodec: Optional[str]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        final = self.path_for(video_id)
+        tmp = final + ".part"
+        codec = ["-c:a", "copy"] if (acodec or "").lower() == "opus" else ["-c:a", "libopus", "-b:a", "128k"]
+
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5",
+            "-i", stream_url, "-vn", *codec, "-f", "ogg", tmp,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        # Background priority, set from here: preexec_fn isn't safe with the voice/executor threads running
+        if hasattr(os, "setpriority"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, proc.pid, 19)
+            except OSError:
+                pass  # already exited
+        try:
+            code = await proc.wait()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+
+        if code != 0 or not os.path.exists(tmp):
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+
+        os.replace(tmp, final)
+        entry = self.entries.setdefault(video_id, {"plays": 0, "last": time.time(), "bytes": 0})
+        entry["bytes"] = os.path.getsize(final)
+        self._evict()
+        await asyncio.to_thread(self.save_index)
+
+    def _evict(self) -> None:
+        used = self.used_bytes()
+        if used <= self.max_bytes:
+            return
+        cached = sorted(
+            (k for k, e in self.entries.items() if e.get("bytes")),
+            key=lambda k: (self.entries[k].get("plays", 0), self.entries[k].get("last", 0)),
+        )
+        for video_id in cached:
+            if used <= self.max_bytes:
+                break
+            used -= int(self.entries[video_id].get("bytes") or 0)
+            self.entries[video_id]["bytes"] = 0
+            try:
+                os.remove(self.path_for(video_id))
+            except FileNotFoundError:
+                pass
+            except Exception:
+                LOG.exception("Music: failed to evict %s from audio cache", video_id)
+
+    def save_index(self) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.index_path)
+        except Exception:
+            LOG.exception("Music: failed to write audio cache index")
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; safe to observe from the audio thread."""
+
+    def __init__(self, buckets: tuple[float, ...] = METRIC_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot = +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            idx = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            self.counts[idx] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-th observation (None if empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[idx] if idx < len(self.buckets) else self.max
+        return self.max
+
+    def export(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "max": round(self.max, 4),
+            "buckets": {str(b): n for b, n in zip(list(self.buckets) + ["+Inf"], self.counts)},
+        }
+
+
+class MusicMetrics:
+    """Histograms and counters for where music time goes."""
+
+    HISTOGRAMS = (
+        "extract_seconds",          # full yt-dlp extraction (one video)
+        "flat_extract_seconds",     # playlist listing / search without streams
+        "time_to_first_audio_seconds",  # !play received -> first audio packet
+        "track_gap_seconds",        # previous track ended -> next first packet
+    )
+    COUNTERS = (
+        "player_errors",            # ffmpeg/player reported an error
+        "stream_retries",           # track died early and was restarted with a fresh URL
+        "resolve_failures",         # queued track couldn't be resolved and was skipped
+    )
+
+    def __init__(self) -> None:
+        self.histograms = {name: Histogram() for name in self.HISTOGRAMS}
+        self.counters = {name: 0 for name in self.COUNTERS}
+
+    def observe(self, name: str, value: float) -> None:
+        self.histograms[name].observe(value)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+
+class InstrumentedSource(discord.AudioSource):
+    """
+    Wraps a source to report when its first audio packet is read, and counts
+    packets so the playback position is known without any clock bookkeeping
+    (pauses, stalls and reconnect gaps simply don't produce packets).
+    """
+
+    def __init__(self, inner: discord.AudioSource, on_first_packet: Callable[[float], None]) -> None:
+        self.inner = inner
+        self._on_first_packet: Optional[Callable[[float], None]] = on_first_packet
+        self.packets = 0
+
+    @property
+    def elapsed(self) -> float:
+        return self.packets * FRAME_SECONDS
+
+    def read(self) -> bytes:
+        data = self.inner.read()
+        if not data:
+            return data
+        self.packets += 1
+        if self._on_first_packet is not None:
+            callback, self._on_first_packet = self._on_first_packet, None
+            try:
+                callback(time.monotonic())
+            except Exception:
+                LOG.exception("Music: first-packet callback failed")
+        return data
+
+    def is_opus(self) -> bool:
+        return self.inner.is_opus()
+
+    def cleanup(self) -> None:
+        self.inner.cleanup()
+
+
+def parse_seek(text: str, current: float) -> Optional[float]:
+    """
+    "90", "1:30" and "1:02:03" are absolute; a leading +/- is relative to
+    the current position. Returns None if the text isn't a time.
+    """
+    match = SEEK_RE.match(text.strip())
+    if not match:
+        return None
+    sign, first, second, last = match.groups()
+    parts = [float(p) for p in (first, second, last) if p is not None]
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    if sign == "+":
+        return current + seconds
+    if sign == "-":
+        return current - seconds
+    return seconds
+
+
+def normalise_search(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class SearchSuggestions:
+    """
+    Debounced, cached YouTube search for /play autocomplete.
+
+    - Results are cached per normalised query with a TTL; while a query is
+      still being typed, the longest cached prefix answers instantly.
+    - Each user has at most one search in flight; extra keystrokes are
+      answered from the cache instead of starting another extraction.
+    - Identical queries from different users share one search.
+    """
+
+    def __init__(self, search: Callable[[str], Awaitable[list[dict]]]) -> None:
+        self.search = search
+        self._cache: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._latest: dict[int, str] = {}       # user id -> newest query typed
+        self._busy_users: set[int] = set()
+
+    def cached(self, query: str) -> Optional[list[dict]]:
+        """Exact hit, else the results for the longest cached prefix of the query."""
+        now = time.monotonic()
+        for end in range(len(query), AUTOCOMPLETE_MIN_CHARS - 1, -1):
+            entry = self._cache.get(query[:end])
+            if entry and entry[0] > now:
+                self._cache.move_to_end(query[:end])
+                return entry[1]
+        return None
+
+    def _store(self, query: str, results: list[dict]) -> None:
+        self._cache[query] = (time.monotonic() + AUTOCOMPLETE_CACHE_TTL, results)
+        self._cache.move_to_end(query)
+        while len(self._cache) > AUTOCOMPLETE_CACHE_MAX:
+            self._cache.popitem(last=False)
+
+    async def _search_and_store(self, query: str) -> list[dict]:
+        try:
+            results = await self.search(query)
+        except Exception:
+            LOG.warning("Music: autocomplete search failed for %r", query)
+            results = []
+        self._store(query, results)
+        return results
+
+    async def suggest(self, user_id: int, raw: str) -> list[dict]:
+        query = normalise_search(raw)
+        if len(query) < AUTOCOMPLETE_MIN_CHARS or URL_RE.match(query):
+            return []
+
+        exact = self._cache.get(query)
+        if exact and exact[0] > time.monotonic():
+            return exact[1]
+
+        # Debounce: only the newest keystroke per user goes on to search.
+        self._latest[user_id] = query
+        await asyncio.sleep(AUTOCOMPLETE_DEBOUNCE)
+        if self._latest.get(user_id) != query or user_id in self._busy_users:
+            return self.cached(query) or []
+
+        task = self._inflight.get(query)
+        if task is None:
+            task = asyncio.create_task(self._search_and_store(query))
+            self._inflight[query] = task
+            task.add_done_callback(lambda _t, q=query: self._inflight.pop(q, None))
+
+        self._busy_users.add(user_id)
+        try:
+            # Shielded: if we run out of time the search still finishes and fills the cache.
+            return await asyncio.wait_for(asyncio.shield(task), AUTOCOMPLETE_BUDGET)
+        except asyncio.TimeoutError:
+            return self.cached(query) or []
+        finally:
+            self._busy_users.discard(user_id)
+
+
+_EXTRACT_CANCELLED = object()  # in-flight result when its owner was cancelled
+
+
+class ExtractCache:
+    """
+    LRU cache of yt-dlp results with a per-entry TTL.
+
+    The TTL comes from the stream URL's own expire= parameter, so a cached
+    entry is never handed out after YouTube would reject its URL.
+    Concurrent lookups for the same key share one in-flight extraction; if
+    the caller that started it is cancelled, the others retry instead of
+    being cancelled along with it.
+    """
+
+    def __init__(self, max_entries: int = EXTRACT_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _ttl_for(self, info: dict) -> float:
+        expire = stream_url_expiry(info.get("url") or "")
+        if expire is None:
+            return EXTRACT_CACHE_DEFAULT_TTL
+        return min(expire - time.time() - EXTRACT_CACHE_EXPIRE_MARGIN, EXTRACT_CACHE_MAX_TTL)
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        deadline, info = entry
+        if time.monotonic() >= deadline:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return info
+
+    def put(self, key: str, info: dict) -> None:
+        ttl = self._ttl_for(info)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, info)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def get_or_extract(self, key: str, extract: Callable[[], Awaitable[dict]]) -> dict:
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            info = await asyncio.shield(pending)
+            if info is not _EXTRACT_CANCELLED:
+                self.hits += 1
+                return info
+            # Whoever started that extraction was cancelled (skip/stop/leave); run it ourselves.
+
+        self.misses += 1
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            info = await extract()
+        except asyncio.CancelledError:
+            # Not fut.cancel(): that would cancel every caller sharing it, not just this one.
+            fut.set_result(_EXTRACT_CANCELLED)
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved so lone failures don't warn
+            raise
+        else:
+            if info and not info.get("entries"):
+                self.put(key, info)
+            fut.set_result(info)
+            return info
+        finally:
+            self._inflight.pop(key, None)
 
 
 @dataclass
@@ -70,43 +819,408 @@ class QueueItem:
     requested_by: str
     duration: Optional[int] = None
     thumbnail: Optional[str] = None
+    requester_id: Optional[int] = None
+    expires_at: Optional[float] = None   # unix time the stream URL stops working
+    start_at: float = 0.0                # seconds into the track to start from
+    retries: int = 0
+    acodec: Optional[str] = None         # audio codec reported by yt-dlp ("opus", "mp4a.40.2", ...)
+    local_path: Optional[str] = None     # set when playing from the on-disk audio cache
+    requested_at: Optional[float] = None  # monotonic !play time, for time-to-first-audio
+
+    @property
+    def resolved(self) -> bool:
+        """False for lazy playlist placeholders whose stream URL isn't fetched yet."""
+        return bool(self.stream_url)
+
+    def is_stale(self) -> bool:
+        """True if the stream URL won't last until the end of the track."""
+        if self.expires_at is None:
+            return False
+        remaining = max(0.0, (self.duration or 0) - self.start_at)
+        return time.time() + remaining + STREAM_URL_REFRESH_MARGIN >= self.expires_at
+
+
+class MusicQueue(deque):
+    """
+    Deque-backed play queue: O(1) append/popleft, plus the positional
+    edits the queue commands need. Positions are 0-based here; commands
+    translate from the 1-based numbers shown in !queue.
+    """
+
+    def page(self, start: int, count: int) -> list[QueueItem]:
+        return list(islice(self, start, start + count))
+
+    def remove_at(self, index: int) -> QueueItem:
+        item = self[index]
+        del self[index]
+        return item
+
+    def move(self, src: int, dst: int) -> QueueItem:
+        item = self.remove_at(src)
+        self.insert(dst, item)
+        return item
+
+    def shuffle(self) -> None:
+        items = list(self)
+        random.shuffle(items)
+        self.clear()
+        self.extend(items)
+
+    def remove_where(self, predicate: Callable[[QueueItem], bool]) -> int:
+        kept = [item for item in self if not predicate(item)]
+        removed = len(self) - len(kept)
+        if removed:
+            self.clear()
+            self.extend(kept)
+        return removed
+
+    def remove_by_user(self, user_id: int) -> int:
+        return self.remove_where(lambda item: item.requester_id == user_id)
+
+    def dedupe(self) -> int:
+        """Drop later copies of the same track (by webpage URL / video id)."""
+        seen: set[str] = set()
+
+        def _dupe(item: QueueItem) -> bool:
+            key = youtube_video_id(item.webpage_url) or item.webpage_url or item.stream_url
+            if key in seen:
+                return True
+            seen.add(key)
+            return False
+
+        return self.remove_where(_dupe)
+
+
+class QueuePagesView(discord.ui.View):
+    """Prev/next buttons over the live queue; each page is rendered only when shown."""
+
+    def __init__(self, cog: "Music", guild_id: int, author_id: int) -> None:
+        super().__init__(timeout=QUEUE_VIEW_TIMEOUT)
+        self.cog = cog
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.page = 0
+        self.message: Optional[discord.Message] = None
+
+    def page_count(self) -> int:
+        state = self.cog.state_for(self.guild_id)
+        return max(1, -(-len(state.queue) // QUEUE_PAGE_SIZE))
+
+    def render(self) -> Optional[discord.Embed]:
+        state = self.cog.state_for(self.guild_id)
+        pages = self.page_count()
+        self.page = max(0, min(self.page, pages - 1))
+
+        lines: list[str] = []
+        if state.current:
+            now_line = f"**Now:** {discord.utils.escape_markdown(state.current.title)}"
+            now_duration = format_duration(state.current.duration)
+            if now_duration:
+                now_line += f" ({now_duration})"
+            lines.append(now_line)
+
+        start = self.page * QUEUE_PAGE_SIZE
+        page_items = state.queue.page(start, QUEUE_PAGE_SIZE)
+        if page_items:
+            if lines:
+                lines.append("")
+            lines.append("**Up next:**")
+            for idx, item in enumerate(page_items, start=start + 1):
+                line = f"{idx}. {discord.utils.escape_markdown(item.title)}"
+                duration_text = format_duration(item.duration)
+                if duration_text:
+                    line += f" ({duration_text})"
+                lines.append(line)
+
+        if not lines:
+            return None
+
+        embed = discord.Embed(title="Music queue", description="\n".join(lines), color=EMBED_COLOR)
+        embed.set_footer(text=f"Page {self.page + 1}/{pages} · {len(state.queue)} queued")
+        self.prev_button.disabled = self.page <= 0
+        self.next_button.disabled = self.page >= pages - 1
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "Use `!queue` to get your own pager.",
+                ephemeral=True,
+            )
+            return False
+        return True
+
+    async def _flip(self, interaction: discord.Interaction, delta: int) -> None:
+        self.page += delta
+        embed = self.render()
+        if embed is None:
+            await interaction.response.edit_message(content="The queue is empty.", embed=None, view=None)
+            self.stop()
+            return
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._flip(interaction, -1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._flip(interaction, 1)
+
+    async def on_timeout(self) -> None:
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except Exception:
+                pass
+
+
+def item_to_dict(item: QueueItem) -> dict:
+    return {field: getattr(item, field) for field in PERSISTED_ITEM_FIELDS}
+
+
+def item_from_dict(data: dict) -> Optional[QueueItem]:
+    """Saved items come back as placeholders; stream URLs are re-resolved on play."""
+    if not isinstance(data, dict) or not data.get("webpage_url"):
+        return None
+    return QueueItem(
+        title=str(data.get("title") or "Unknown title"),
+        stream_url="",
+        webpage_url=str(data["webpage_url"]),
+        requested_by=str(data.get("requested_by") or "someone"),
+        duration=data.get("duration"),
+        thumbnail=data.get("thumbnail"),
+        requester_id=data.get("requester_id"),
+    )
+
+
+class ResumeQueueView(discord.ui.View):
+    """Posted after a restart when a guild had music queued: resume or discard it."""
+
+    def __init__(self, cog: "Music", guild_id: int, snapshot: dict) -> None:
+        super().__init__(timeout=RESUME_OFFER_TIMEOUT)
+        self.cog = cog
+        self.guild_id = guild_id
+        self.snapshot = snapshot
+        self.message: Optional[discord.Message] = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Only people who'd actually be listening (or mods) get to decide
+        member = interaction.user
+        if isinstance(member, discord.Member) and (
+            permissions.is_mod_member(member) or (member.voice and member.voice.channel)
+        ):
+            return True
+        await interaction.response.send_message(
+            "Join a voice channel to resume or discard the saved queue.",
+            ephemeral=True,
+        )
+        return False
+
+    async def _finish(self, interaction: discord.Interaction, text: str) -> None:
+        self.stop()
+        await interaction.response.edit_message(content=text, embed=None, view=None)
+
+    @discord.ui.button(label="Resume", style=discord.ButtonStyle.primary)
+    async def resume_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        if not interaction.guild:
+            return
+        # Connecting to voice can outlast the 3s interaction window
+        await interaction.response.defer()
+        error = await self.cog.resume_saved(interaction.guild, self.snapshot)
+        if error:
+            await interaction.followup.send(error, ephemeral=True)
+            return
+        self.stop()
+        await interaction.edit_original_response(
+            content=f"Resumed by {interaction.user.mention}.", embed=None, view=None
+        )
+
+    @discord.ui.button(label="Discard", style=discord.ButtonStyle.secondary)
+    async def discard_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        self.cog.pending_resume.pop(self.guild_id, None)
+        self.cog.mark_dirty()
+        await self._finish(interaction, f"Saved queue discarded by {interaction.user.mention}.")
+
+    async def on_timeout(self) -> None:
+        # Nobody answered: drop the snapshot so it isn't offered again after every restart
+        if self.cog.pending_resume.get(self.guild_id) is self.snapshot:
+            self.cog.pending_resume.pop(self.guild_id, None)
+            self.cog.mark_dirty()
+        if self.message:
+            try:
+                await self.message.edit(content="Resume offer expired; the saved queue was dropped.", embed=None, view=None)
+            except Exception:
+                pass
+
+
+@dataclass
+class PlayerEvent:
+    """
+    Something the guild's player loop should act on:
+    - play:  the queue gained items; start playing if idle
+    - skip / seek: stop (or restart at `position`) the track playing `source`
+    - stop:  clear everything and go quiet
+    - ended / error: `source` finished (posted from the audio thread)
+    - ready: `item` was resolved off the loop; `source` is its audio (None if unplayable)
+    Events naming a `source` are ignored once that source is no longer current,
+    so a late skip or end notification can't hit the next track.
+    """
+
+    kind: str
+    source: Optional[discord.AudioSource] = None
+    at: Optional[float] = None
+    position: float = 0.0
+    error: Optional[BaseException] = None
+    item: Optional[QueueItem] = None
 
 
 class GuildMusicState:
     def __init__(self) -> None:
-        self.queue: list[QueueItem] = []
+        self.queue: MusicQueue = MusicQueue()
         self.voice_client: Optional[discord.VoiceClient] = None
         self.current: Optional[QueueItem] = None
         self.text_channel_id: Optional[int] = None
-        self.lock = asyncio.Lock()
+        # One slot per !play still extracting, in request order; see reserve_slot.
+        self.pending_adds: deque[list] = deque()
+        # The next track while yt-dlp/ffprobe work on it, off the player loop (see start_next).
+        self.resolving: Optional[QueueItem] = None
+        self.resolve_task: Optional[asyncio.Task] = None
+        # Everything that starts/stops playback goes through the player loop (see Music.post).
+        self.events: asyncio.Queue[PlayerEvent] = asyncio.Queue()
+        self.player_task: Optional[asyncio.Task] = None
+        self.prefetch_task: Optional[asyncio.Task] = None
+        self.track_ended_at: Optional[float] = None  # monotonic time the last track finished
+        self.play_started_at: Optional[float] = None  # monotonic, shifted forward by pauses
+        self.paused_at: Optional[float] = None
+        self.stop_requested = False  # set by skip/stop so an intended stop isn't "retried"
+        self.source: Optional[discord.AudioSource] = None  # owns the ffmpeg child process
+        self.idle_task: Optional[asyncio.Task] = None
+        self.quiet_start = False  # seek/replay: don't re-announce the same track
+
+    def cancel_idle(self) -> None:
+        if self.idle_task and not self.idle_task.done():
+            self.idle_task.cancel()
+        self.idle_task = None
+
+    def release_source(self) -> None:
+        """Kill the ffmpeg child if it's still around (cleanup is idempotent)."""
+        if self.source is not None:
+            try:
+                self.source.cleanup()
+            except Exception:
+                LOG.exception("Music: failed to clean up audio source")
+            self.source = None
+
+    def reserve_slot(self) -> list:
+        """
+        Hold a place in line for a !play whose extraction hasn't finished.
+        Extractions run concurrently; their results are queued in the order
+        the requests arrived, not the order they finish.
+        """
+        slot: list = [None]
+        self.pending_adds.append(slot)
+        return slot
+
+    def holds_slot(self, slot: list) -> bool:
+        """False once the slot was dropped (by !stop / leave) while extracting."""
+        return any(pending is slot for pending in self.pending_adds)
+
+    def fill_slot(self, slot: list, items: list[QueueItem]) -> bool:
+        """
+        Record a finished extraction and queue every leading slot that is ready.
+        Synchronous, so it can't interleave with other queue edits. Returns
+        True if anything was added to the queue — possibly other requests'
+        items that were waiting behind this slot, even when `items` is empty.
+        """
+        if not self.holds_slot(slot):
+            return False
+        slot[0] = items
+        added = False
+        while self.pending_adds and self.pending_adds[0][0] is not None:
+            ready = self.pending_adds.popleft()[0]
+            self.queue.extend(ready)
+            added = added or bool(ready)
+        return added
 
     def reset(self) -> None:
         self.queue.clear()
+        self.pending_adds.clear()
         self.current = None
         self.text_channel_id = None
+        self.track_ended_at = None
+        if self.prefetch_task and not self.prefetch_task.done():
+            self.prefetch_task.cancel()
+        self.prefetch_task = None
+        self.cancel_resolve()
+        self.cancel_idle()
+        self.release_source()
+
+    def cancel_resolve(self) -> None:
+        if self.resolve_task and not self.resolve_task.done():
+            self.resolve_task.cancel()
+        self.resolve_task = None
+        self.resolving = None
 
 
 class Music(commands.Cog):
-    """Prefix-only music cog locked to the music channel."""
+    """Music cog locked to the music channel (prefix commands, plus /play as a slash command)."""
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.states: dict[int, GuildMusicState] = {}
         self.session: Optional[aiohttp.ClientSession] = None
         self.cookiefile_path: Optional[str] = None
+        self.extract_cache = ExtractCache()
+        self.metrics = MusicMetrics()
+        self.pending_resume: dict[int, dict] = {}  # guild id -> snapshot awaiting Resume/Discard
+        self._persist_task: Optional[asyncio.Task] = None
+        self._resume_task: Optional[asyncio.Task] = None
+        self.suggestions = SearchSuggestions(self.youtube_search_results)
+        self.spotify_map = SpotifyMapCache(SPOTIFY_MAP_PATH)
+        self.audio_cache: Optional[AudioCache] = (
+            AudioCache(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES) if AUDIO_CACHE_ENABLED else None
+        )
+        self.spotify = SpotifyResolver(self.fetch_text, self.youtube_search_match, self.spotify_map)
 
     async def cog_load(self) -> None:
         self.session = aiohttp.ClientSession()
         self.cookiefile_path = self.prepare_cookie_file()
+        await asyncio.to_thread(self.spotify_map.load)
+        if self.audio_cache:
+            self.audio_cache.start()
+        self.pending_resume = self.load_snapshot()
+        if self.pending_resume:
+            self._resume_task = asyncio.create_task(self._offer_resume())
+        self.persist_position_loop.start()
 
     async def cog_unload(self) -> None:
+        # Snapshot before tearing voice down, so a reload can pick up where we were.
+        self.persist_position_loop.cancel()
+        if self._persist_task and not self._persist_task.done():
+            self._persist_task.cancel()
+        if self._resume_task and not self._resume_task.done():
+            self._resume_task.cancel()
+        self.write_snapshot(self.build_snapshot())
+        self.spotify_map.save()
+        if self.audio_cache:
+            self.audio_cache.stop()
+
         for state in self.states.values():
+            if state.player_task and not state.player_task.done():
+                state.player_task.cancel()
+            if state.prefetch_task and not state.prefetch_task.done():
+                state.prefetch_task.cancel()
+            state.cancel_resolve()
+            state.cancel_idle()
+            state.stop_requested = True
             vc = state.voice_client
             if vc and vc.is_connected():
                 try:
                     await vc.disconnect(force=True)
                 except Exception:
                     pass
+            state.release_source()
         if self.session and not self.session.closed:
             await self.session.close()
 
@@ -152,6 +1266,238 @@ class Music(commands.Cog):
 
         return None
 
+    # ── persistence ────────────────────────────────────────────────
+    def playback_position(self, state: GuildMusicState, now: Optional[float] = None) -> float:
+        """Seconds into the current track (0 if nothing is playing)."""
+        if state.current is None:
+            return 0.0
+        if isinstance(state.source, InstrumentedSource):
+            return state.current.start_at + state.source.elapsed
+        if state.play_started_at is None:
+            return 0.0
+        if now is None:
+            now = state.paused_at if state.paused_at is not None else time.monotonic()
+        return state.current.start_at + max(0.0, now - state.play_started_at)
+
+    def build_snapshot(self) -> dict:
+        snapshot: dict[str, dict] = {str(gid): snap for gid, snap in self.pending_resume.items()}
+        for guild_id, state in self.states.items():
+            # The item being resolved was already popped off the queue; keep its place.
+            queued = ([state.resolving] if state.resolving else []) + list(state.queue)
+            if not state.current and not queued:
+                continue
+            vc = state.voice_client
+            current = None
+            if state.current:
+                current = item_to_dict(state.current)
+                current["position"] = round(self.playback_position(state), 1)
+            snapshot[str(guild_id)] = {
+                "voice_channel_id": vc.channel.id if vc and vc.channel else None,
+                "text_channel_id": state.text_channel_id,
+                "current": current,
+                "queue": [item_to_dict(item) for item in queued],
+            }
+        return snapshot
+
+    def load_snapshot(self) -> dict[int, dict]:
+        try:
+            with open(MUSIC_STATE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            LOG.exception("Music: failed to read %s", MUSIC_STATE_PATH)
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {int(gid): snap for gid, snap in data.items() if isinstance(snap, dict)}
+
+    @staticmethod
+    def write_snapshot(snapshot: dict) -> None:
+        try:
+            parent = os.path.dirname(MUSIC_STATE_PATH)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            tmp = MUSIC_STATE_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp, MUSIC_STATE_PATH)
+        except Exception:
+            LOG.exception("Music: failed to write %s", MUSIC_STATE_PATH)
+
+    def mark_dirty(self) -> None:
+        """Schedule a debounced snapshot write; bursts of edits share one write."""
+        if self._persist_task is None or self._persist_task.done():
+            self._persist_task = asyncio.create_task(self._persist_after_debounce())
+
+    async def _persist_after_debounce(self) -> None:
+        await asyncio.sleep(PERSIST_DEBOUNCE_SECONDS)
+        await asyncio.to_thread(self.write_snapshot, self.build_snapshot())
+
+    @tasks.loop(seconds=PERSIST_POSITION_SECONDS)
+    async def persist_position_loop(self) -> None:
+        # Positions move without any queue edit; re-save while something plays.
+        if any(state.current for state in self.states.values()):
+            self.mark_dirty()
+
+    async def _offer_resume(self) -> None:
+        await self.bot.wait_until_ready()
+        for guild_id, snap in list(self.pending_resume.items()):
+            guild = self.bot.get_guild(guild_id)
+            channel = guild.get_channel(snap.get("text_channel_id") or MUSIC_TEXT_CHANNEL_ID) if guild else None
+            if not isinstance(channel, discord.TextChannel):
+                continue
+
+            count = len(snap.get("queue") or []) + (1 if snap.get("current") else 0)
+            desc = f"I was playing **{count}** track(s) before restarting."
+            current = snap.get("current")
+            if current:
+                desc += f"\nLast up: **{discord.utils.escape_markdown(str(current.get('title') or ''))}**"
+                position = format_duration(int(current.get("position") or 0))
+                if position:
+                    desc += f" at {position}"
+
+            view = ResumeQueueView(self, guild_id, snap)
+            try:
+                embed = discord.Embed(title="Resume music?", description=desc, color=EMBED_COLOR)
+                view.message = await channel.send(embed=embed, view=view)
+            except Exception:
+                LOG.exception("Music: failed to post resume offer")
+
+    async def resume_saved(self, guild: discord.Guild, snap: dict) -> Optional[str]:
+        """Rejoin the saved voice channel and restore the queue. Returns an error message or None."""
+        channel = guild.get_channel(snap.get("voice_channel_id") or 0)
+        if not isinstance(channel, (discord.VoiceChannel, discord.StageChannel)):
+            return "The voice channel I was in no longer exists."
+
+        vc = guild.voice_client
+        try:
+            if vc and vc.is_connected():
+                if vc.channel != channel:
+                    await vc.move_to(channel)
+            else:
+                vc = await channel.connect(self_deaf=True)
+        except Exception:
+            LOG.exception("Music: failed to rejoin voice for resume")
+            return "I couldn't rejoin that voice channel."
+
+        restored: list[QueueItem] = []
+        current = item_from_dict(snap.get("current") or {})
+        if current:
+            current.start_at = float((snap.get("current") or {}).get("position") or 0.0)
+            restored.append(current)
+        restored.extend(filter(None, (item_from_dict(d) for d in snap.get("queue") or [])))
+
+        state = self.state_for(guild.id)
+        state.voice_client = vc
+        state.text_channel_id = snap.get("text_channel_id") or MUSIC_TEXT_CHANNEL_ID
+        for item in reversed(restored):
+            state.queue.appendleft(item)
+        self.pending_resume.pop(guild.id, None)
+        self.mark_dirty()
+        self.post(guild.id, PlayerEvent("play"))
+        return None
+
+    # ── idle watchdog / resources ──────────────────────────────────
+    def check_idle(self, guild: discord.Guild) -> None:
+        """
+        Arm the idle timer if nobody (human) is listening or there's nothing
+        left to play; disarm it otherwise. Called from voice-state events and
+        player transitions, never from a polling loop.
+        """
+        state = self.state_for(guild.id)
+        vc = guild.voice_client
+        if not vc or not vc.is_connected():
+            state.cancel_idle()
+            return
+
+        if not self.is_idle(vc, state):
+            state.cancel_idle()
+        elif state.idle_task is None or state.idle_task.done():
+            state.idle_task = asyncio.create_task(self._idle_disconnect(guild.id))
+
+    def is_idle(self, vc: discord.VoiceClient, state: GuildMusicState) -> bool:
+        """No human listening, or nothing playing, queued, resolving or still extracting."""
+        listeners = [m for m in getattr(vc.channel, "members", []) if not m.bot]
+        busy = (
+            vc.is_playing() or vc.is_paused() or state.resolving is not None
+            or bool(state.queue) or bool(state.pending_adds)
+        )
+        return not (listeners and busy)
+
+    async def _idle_disconnect(self, guild_id: int) -> None:
+        await asyncio.sleep(IDLE_DISCONNECT_SECONDS)
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return
+        state = self.state_for(guild_id)
+        state.idle_task = None  # we're the timer; don't let teardown cancel us mid-flight
+        vc = guild.voice_client
+        if vc and vc.is_connected() and not self.is_idle(vc, state):
+            return  # something started (e.g. a !play still extracting) while we slept
+        LOG.info("Music: idle for %ss in guild %s, leaving voice", IDLE_DISCONNECT_SECONDS, guild_id)
+        await self.teardown_voice(guild)
+
+        channel = guild.get_channel(state.text_channel_id or MUSIC_TEXT_CHANNEL_ID)
+        if isinstance(channel, discord.TextChannel):
+            await self.send_embed(channel, "Disconnected", "Left voice after being idle.")
+
+    async def teardown_voice(self, guild: discord.Guild) -> None:
+        """Leave voice and release everything the guild holds (timers, tasks, ffmpeg)."""
+        state = self.state_for(guild.id)
+        state.stop_requested = True
+        vc = guild.voice_client
+        if vc and vc.is_connected():
+            try:
+                await vc.disconnect(force=True)
+            except Exception:
+                LOG.exception("Music: failed to disconnect")
+        state.reset()
+        state.voice_client = None
+        self.mark_dirty()
+
+    def resource_gauge(self) -> dict[str, int]:
+        """What the cog is holding right now."""
+        voice = sum(1 for vc in self.bot.voice_clients if vc.is_connected())
+        ffmpeg = 0
+        for state in self.states.values():
+            inner = getattr(state.source, "inner", state.source)
+            poll = getattr(getattr(inner, "_process", None), "poll", None)
+            if callable(poll) and poll() is None:
+                ffmpeg += 1
+        return {
+            "voice_clients": voice,
+            "ffmpeg_processes": ffmpeg,
+            "idle_timers": sum(1 for st in self.states.values() if st.idle_task and not st.idle_task.done()),
+            "prefetch_tasks": sum(1 for st in self.states.values() if st.prefetch_task and not st.prefetch_task.done()),
+        }
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ) -> None:
+        guild = member.guild
+        if self.bot.user and member.id == self.bot.user.id:
+            if after.channel is None:
+                # Kicked / disconnected from outside: drop what we were holding.
+                state = self.state_for(guild.id)
+                state.stop_requested = True
+                state.reset()
+                state.voice_client = None
+                self.mark_dirty()
+                return
+            self.check_idle(guild)
+            return
+
+        vc = guild.voice_client
+        if not vc or not vc.channel:
+            return
+        if before.channel == vc.channel or after.channel == vc.channel:
+            self.check_idle(guild)
+
     def state_for(self, guild_id: int) -> GuildMusicState:
         return self.states.setdefault(guild_id, GuildMusicState())
 
@@ -210,14 +1556,48 @@ class Music(commands.Cog):
         state.text_channel_id = MUSIC_TEXT_CHANNEL_ID
         return vc
 
-    async def ytdl_extract(self, query: str, *, search: bool = False) -> dict:
+    async def ytdl_extract(
+        self,
+        query: str,
+        *,
+        search: bool = False,
+        fresh: bool = False,
+        flat: bool = False,
+        results: int = 1,
+    ) -> dict:
+        """
+        yt-dlp extraction, served from the cache for single YouTube videos.
+        `flat=True` lists playlist entries without resolving their streams.
+        """
+        video_id = None if (search or flat) else youtube_video_id(query)
+        if video_id is None:
+            return await self._ytdl_extract_uncached(query, search=search, flat=flat, results=results)
+
+        if fresh:
+            self.extract_cache.invalidate(video_id)
+        return await self.extract_cache.get_or_extract(
+            video_id,
+            lambda: self._ytdl_extract_uncached(query, search=search),
+        )
+
+    async def _ytdl_extract_uncached(
+        self,
+        query: str,
+        *,
+        search: bool = False,
+        flat: bool = False,
+        results: int = 1,
+    ) -> dict:
         opts = dict(YTDL_BASE_OPTS)
 
         if self.cookiefile_path:
             opts["cookiefile"] = self.cookiefile_path
 
+        if flat:
+            opts["extract_flat"] = "in_playlist"
+
         if search:
-            target = f"ytsearch1:{query}"
+            target = f"ytsearch{results}:{query}"
             opts["noplaylist"] = True
         else:
             target = query
@@ -227,7 +1607,14 @@ class Music(commands.Cog):
                 return ydl.extract_info(target, download=False)
 
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, _run)
+        started = time.monotonic()
+        try:
+            return await loop.run_in_executor(None, _run)
+        finally:
+            self.metrics.observe(
+                "flat_extract_seconds" if (flat or search) else "extract_seconds",
+                time.monotonic() - started,
+            )
 
     def _host(self, url: str) -> str:
         try:
@@ -267,18 +1654,10 @@ class Music(commands.Cog):
             LOG.exception("Music: failed to resolve Spotify URL")
             return url
 
-    async def spotify_track_to_search(self, url: str) -> Optional[str]:
-        """Best-effort Spotify track metadata fetch without extra dependencies."""
+    async def fetch_text(self, url: str) -> Optional[str]:
         if not self.session:
             return None
 
-        url = await self.resolve_spotify_url(url)
-
-        if not SPOTIFY_TRACK_RE.search(url):
-            return None
-
-        lookup_url = url.split("?", 1)[0]
-
         headers = {
             "User-Agent": (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -289,32 +1668,36 @@ class Music(commands.Cog):
 
         try:
             async with self.session.get(
-                lookup_url,
+                url,
                 headers=headers,
                 allow_redirects=True,
                 timeout=aiohttp.ClientTimeout(total=15),
             ) as resp:
                 if resp.status != 200:
                     return None
-                html = await resp.text()
+                return await resp.text()
         except Exception:
-            LOG.exception("Music: failed to fetch Spotify page")
-            return None
-
-        title_match = re.search(r'<meta\s+property="og:title"\s+content="([^"]+)"', html, re.IGNORECASE)
-        desc_match = re.search(r'<meta\s+property="og:description"\s+content="([^"]+)"', html, re.IGNORECASE)
-
-        title = html_unescape(title_match.group(1).strip()) if title_match else ""
-        desc = html_unescape(desc_match.group(1).strip()) if desc_match else ""
-
-        if not title:
+            LOG.exception("Music: failed to fetch %s", url)
             return None
 
-        query_parts = [title]
-        if desc and desc.lower() not in title.lower():
-            query_parts.append(desc)
-
-        return " ".join(query_parts) + " audio"
+    async def youtube_search_results(self, query: str, count: int = AUTOCOMPLETE_RESULTS) -> list[dict]:
+        """YouTube search hits as {id, title, duration}, listed flat (no stream resolution)."""
+        info = await self.ytdl_extract(query, search=True, flat=True, results=count)
+        hits: list[dict] = []
+        for entry in info.get("entries") or [info]:
+            video_id = entry.get("id") if entry else None
+            if video_id and YOUTUBE_ID_RE.match(video_id):
+                hits.append({
+                    "id": video_id,
+                    "title": entry.get("title"),
+                    "duration": entry.get("duration"),
+                })
+        return hits
+
+    async def youtube_search_match(self, query: str) -> Optional[dict]:
+        """Best YouTube hit for a search."""
+        hits = await self.youtube_search_results(query, count=1)
+        return hits[0] if hits else None
 
     def queue_item_from_info(self, info: dict, requested_by: str) -> Optional[QueueItem]:
         if not info:
@@ -343,15 +1726,161 @@ class Music(commands.Cog):
             requested_by=requested_by,
             duration=duration,
             thumbnail=thumbnail,
+            expires_at=stream_url_expiry(stream_url),
+            acodec=info.get("acodec"),
+        )
+
+    def placeholder_from_flat_entry(self, entry: dict, requested_by: str) -> Optional[QueueItem]:
+        """Unresolved queue item from an extract_flat playlist entry (no stream URL yet)."""
+        if not entry:
+            return None
+        webpage_url = entry.get("url") or entry.get("webpage_url") or ""
+        if not URL_RE.match(webpage_url) and entry.get("id"):
+            webpage_url = f"https://www.youtube.com/watch?v={entry['id']}"
+        if not webpage_url:
+            return None
+
+        thumbnails = entry.get("thumbnails") or []
+        return QueueItem(
+            title=entry.get("title") or "Unknown title",
+            stream_url="",
+            webpage_url=webpage_url,
+            requested_by=requested_by,
+            duration=entry.get("duration"),
+            thumbnail=thumbnails[-1].get("url") if thumbnails else None,
+        )
+
+    async def resolve_item(self, item: QueueItem, *, fresh: bool = False) -> bool:
+        """
+        Fill in (or refresh) an item's stream URL in place. Placeholders get
+        resolved, stale URLs get re-extracted. Returns False if unplayable.
+        """
+        stale = item.resolved and item.is_stale()
+        if item.resolved and not fresh and not stale:
+            return True
+        if not item.webpage_url:
+            return item.resolved
+        try:
+            info = await self.ytdl_extract(item.webpage_url, fresh=fresh or stale)
+        except Exception:
+            LOG.warning("Music: failed to resolve %s", item.webpage_url)
+            return False
+
+        built = self.queue_item_from_info(info, item.requested_by)
+        if not built:
+            return False
+        item.stream_url = built.stream_url
+        item.expires_at = built.expires_at
+        item.acodec = built.acodec
+        item.title = built.title or item.title
+        item.duration = built.duration or item.duration
+        item.thumbnail = built.thumbnail or item.thumbnail
+        return True
+
+    async def probe_stream_url(self, stream_url: str) -> bool:
+        """Cheap liveness check: ask for one byte of the stream."""
+        if not self.session:
+            return True
+        try:
+            async with self.session.get(
+                stream_url,
+                headers={"Range": "bytes=0-0"},
+                timeout=aiohttp.ClientTimeout(total=PREFETCH_PROBE_TIMEOUT),
+            ) as resp:
+                return resp.status in (200, 206)
+        except Exception:
+            return False
+
+    def schedule_prefetch(self, state: GuildMusicState) -> None:
+        """Resolve + validate the next queued item in the background while this one plays."""
+        if state.prefetch_task and not state.prefetch_task.done():
+            return
+        if not state.queue:
+            return
+        state.prefetch_task = asyncio.create_task(self._prefetch(state.queue[0]))
+
+    async def _prefetch(self, item: QueueItem) -> None:
+        try:
+            if self.audio_cache and self.audio_cache.lookup(item):
+                return
+            if not await self.resolve_item(item):
+                return
+            if not await self.probe_stream_url(item.stream_url):
+                LOG.info("Music: prefetched stream for %s is dead, re-extracting", item.webpage_url)
+                await self.resolve_item(item, fresh=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            LOG.exception("Music: prefetch failed")
+
+    async def build_source(self, item: QueueItem) -> discord.AudioSource:
+        """
+        Opus in → Opus out without re-encoding when possible:
+        - cached locally: the .ogg file, copied straight through
+        - yt-dlp says the stream is Opus: FFmpegOpusAudio with codec=copy
+        - codec unknown: ffprobe it (copies if it turns out to be Opus)
+        - anything else, or if that fails: PCM, encoded by discord.py
+        """
+        seek = f"-ss {item.start_at:.2f} " if item.start_at > 0 else ""
+
+        if item.local_path:
+            return discord.FFmpegOpusAudio(
+                item.local_path,
+                codec="copy",
+                before_options=f"{seek}-nostdin",
+                options=FFMPEG_OPTIONS,
+            )
+
+        before_options = f"{seek}{FFMPEG_BEFORE_OPTIONS}"
+        if OPUS_PASSTHROUGH:
+            try:
+                if (item.acodec or "").lower() == "opus":
+                    return discord.FFmpegOpusAudio(
+                        item.stream_url,
+                        codec="copy",
+                        before_options=before_options,
+                        options=FFMPEG_OPTIONS,
+                    )
+                if item.acodec in (None, "") and OPUS_PROBE_UNKNOWN:
+                    return await discord.FFmpegOpusAudio.from_probe(
+                        item.stream_url,
+                        method="fallback",
+                        before_options=before_options,
+                        options=FFMPEG_OPTIONS,
+                    )
+            except Exception:
+                LOG.warning("Music: Opus source failed for %s, falling back to PCM", item.webpage_url)
+
+        return discord.FFmpegPCMAudio(
+            item.stream_url,
+            before_options=before_options,
+            options=FFMPEG_OPTIONS,
         )
 
     async def build_items_from_input(self, raw_input: str, requested_by: str) -> list[QueueItem]:
         if not URL_RE.match(raw_input):
-            raise commands.BadArgument("Only links are allowed.")
+            # Plain text: queue the top YouTube result (the /play autocomplete shows the options).
+            try:
+                found = await self.youtube_search_match(raw_input)
+            except Exception:
+                raise RuntimeError("YouTube search failed, try a link instead.")
+            if not found:
+                raise RuntimeError("I couldn't find anything on YouTube for that.")
+            return [
+                QueueItem(
+                    title=found.get("title") or raw_input,
+                    stream_url="",
+                    webpage_url=f"https://www.youtube.com/watch?v={found['id']}",
+                    requested_by=requested_by,
+                    duration=found.get("duration"),
+                )
+            ]
 
         if self.is_youtube_url(raw_input):
+            is_single_video = youtube_video_id(raw_input) is not None
             try:
-                info = await self.ytdl_extract(raw_input, search=False)
+                # Playlists are listed flat (titles only); each stream is resolved just before it plays.
+                info = await self.ytdl_extract(raw_input, search=False, flat=not is_single_video)
             except Exception as e:
                 msg = str(e)
                 if "Sign in to confirm you’re not a bot" in msg or "Sign in to confirm you're not a bot" in msg:
@@ -361,37 +1890,60 @@ class Music(commands.Cog):
             if info.get("entries"):
                 items: list[QueueItem] = []
                 for entry in info["entries"]:
-                    built = self.queue_item_from_info(entry, requested_by)
+                    built = (
+                        self.queue_item_from_info(entry, requested_by)
+                        if is_single_video
+                        else self.placeholder_from_flat_entry(entry, requested_by)
+                    )
                     if built:
                         items.append(built)
                 if items:
                     return items
 
+            if not is_single_video and not info.get("url"):
+                # Flat listing of something that isn't a playlist: do a full extraction.
+                try:
+                    info = await self.ytdl_extract(raw_input, search=False)
+                except Exception:
+                    raise RuntimeError("I couldn't read that YouTube link.")
+
             item = self.queue_item_from_info(info, requested_by)
             if not item:
                 raise RuntimeError("I couldn't read that YouTube link.")
             return [item]
 
         if self.is_spotify_url(raw_input):
-            query = await self.spotify_track_to_search(raw_input)
-            if not query:
-                raise RuntimeError(
-                    "That Spotify link couldn't be used. v1 supports Spotify track links, not playlists/albums."
+            url = await self.resolve_spotify_url(raw_input)
+            tracks = await self.spotify.tracks(url)
+            if not tracks:
+                raise RuntimeError("That Spotify link couldn't be read.")
+
+            items: list[QueueItem] = []
+            for track, found in await self.spotify.match_all(tracks):
+                if not found:
+                    continue
+                items.append(
+                    QueueItem(
+                        title=found.get("title") or track.title,
+                        stream_url="",
+                        webpage_url=f"https://www.youtube.com/watch?v={found['id']}",
+                        requested_by=requested_by,
+                        duration=found.get("duration"),
+                    )
                 )
 
-            try:
-                info = await self.ytdl_extract(query, search=True)
-            except Exception:
-                raise RuntimeError("I couldn't find a playable YouTube match for that Spotify track.")
-
-            item = self.queue_item_from_info(info, requested_by)
-            if not item:
-                raise RuntimeError("I found no playable match for that Spotify track.")
-            return [item]
+            if not items:
+                raise RuntimeError("I found no playable YouTube match for that Spotify link.")
+            return items
 
-        raise commands.BadArgument("Unsupported link. Use a YouTube link or a Spotify track link.")
+        raise commands.BadArgument("Unsupported link. Use a YouTube link or a Spotify track, album or playlist link.")
 
     async def start_next(self, guild: discord.Guild) -> None:
+        """
+        Hand the next queued item to a resolver task. Extraction and probing
+        take seconds, so they run off the player loop (skip/stop stay
+        responsive); the task posts a "ready" event and play_ready takes over.
+        """
         state = self.state_for(guild.id)
         vc = state.voice_client or guild.voice_client
         state.voice_client = vc
@@ -400,50 +1952,226 @@ class Music(commands.Cog):
             state.reset()
             return
 
-        if vc.is_playing() or vc.is_paused():
+        if vc.is_playing() or vc.is_paused() or state.resolving is not None:
             return
 
         if not state.queue:
+            state.current = None
+            self.mark_dirty()
+            self.check_idle(guild)
+            return
+
+        item = state.queue.popleft()
+        state.resolving = item
+        state.resolve_task = asyncio.create_task(self._resolve_next(guild.id, item))
+
+    async def _resolve_next(self, guild_id: int, item: QueueItem) -> None:
+        source: Optional[discord.AudioSource] = None
+        try:
+            local = self.audio_cache.lookup(item) if self.audio_cache else None
+            if local:
+                item.local_path = local  # no extraction needed at all
+                source = await self.build_source(item)
+            elif await self.resolve_item(item):
+                source = await self.build_source(item)
+            else:
+                self.metrics.incr("resolve_failures")
+                guild = self.bot.get_guild(guild_id)
+                state = self.state_for(guild_id)
+                channel = guild.get_channel(state.text_channel_id or MUSIC_TEXT_CHANNEL_ID) if guild else None
+                if isinstance(channel, discord.TextChannel):
+                    await self.send_embed(
+                        channel,
+                        "Skipped",
+                        f"Couldn't load **{discord.utils.escape_markdown(item.title)}**, moving on.",
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            LOG.exception("Music: failed to prepare %s", item.webpage_url)
+        self.post(guild_id, PlayerEvent("ready", source=source, item=item))
+
+    async def play_ready(self, guild: discord.Guild, next_item: QueueItem, source: discord.AudioSource) -> None:
+        state = self.state_for(guild.id)
+        vc = state.voice_client or guild.voice_client
+        if not vc or not vc.is_connected():
+            # Left voice while we were resolving
+            source.cleanup()
+            state.queue.appendleft(next_item)
             state.current = None
             return
 
-        next_item = state.queue.pop(0)
         state.current = next_item
+        requested_at, next_item.requested_at = next_item.requested_at, None
+        track_ended_at, state.track_ended_at = state.track_ended_at, None
+
+        def _first_packet(at: float) -> None:
+            # Runs on the audio thread; Histogram.observe is thread-safe.
+            if requested_at is not None:
+                self.metrics.observe("time_to_first_audio_seconds", at - requested_at)
+            if track_ended_at is not None:
+                self.metrics.observe("track_gap_seconds", at - track_ended_at)
+
+        source = InstrumentedSource(source, _first_packet)
+        loop = self.bot.loop
 
         def _after_play(error: Optional[Exception]) -> None:
-            if error:
-                LOG.exception("Music: player error", exc_info=error)
-            fut = asyncio.run_coroutine_threadsafe(self._after_track(guild.id), self.bot.loop)
+            # Audio thread: hand the event to the player loop and return straight away.
+            event = PlayerEvent("error" if error else "ended", source=source, at=time.monotonic(), error=error)
             try:
-                fut.result()
-            except Exception:
-                LOG.exception("Music: failed after-track handler")
-
-        source = discord.FFmpegPCMAudio(
-            next_item.stream_url,
-            before_options=FFMPEG_BEFORE_OPTIONS,
-            options=FFMPEG_OPTIONS,
-        )
+                loop.call_soon_threadsafe(self.post, guild.id, event)
+            except RuntimeError:
+                pass  # event loop already closed (shutdown)
+
+        state.stop_requested = False
+        state.paused_at = None
+        state.play_started_at = time.monotonic()
+        state.release_source()
+        state.source = source
         vc.play(source, after=_after_play)
+        self.check_idle(guild)
+        if self.audio_cache:
+            self.audio_cache.record_play(next_item)
 
+        self.schedule_prefetch(state)
+        self.mark_dirty()
+
+        quiet, state.quiet_start = state.quiet_start, False
         channel = guild.get_channel(state.text_channel_id or MUSIC_TEXT_CHANNEL_ID)
-        if isinstance(channel, discord.TextChannel):
+        if next_item.retries == 0 and not quiet and isinstance(channel, discord.TextChannel):
             desc = f"**{discord.utils.escape_markdown(next_item.title)}**"
             duration_text = format_duration(next_item.duration)
             if duration_text:
                 desc += f"\nDuration: {duration_text}"
+            if next_item.start_at >= 1:
+                desc += f"\nStarting at {format_duration(next_item.start_at)}"
             desc += f"\nRequested by {next_item.requested_by}"
             if next_item.webpage_url:
                 desc += f"\n{next_item.webpage_url}"
             await self.send_embed(channel, "Now playing", desc)
 
-    async def _after_track(self, guild_id: int) -> None:
-        guild = self.bot.get_guild(guild_id)
-        if not guild:
+    # ── player loop ────────────────────────────────────────────────
+    def post(self, guild_id: int, event: PlayerEvent) -> None:
+        """Queue an event for the guild's player loop, starting the loop if needed. Never blocks."""
+        state = self.state_for(guild_id)
+        if state.player_task is None or state.player_task.done():
+            state.player_task = asyncio.create_task(self.player_loop(guild_id))
+        state.events.put_nowait(event)
+
+    async def player_loop(self, guild_id: int) -> None:
+        """
+        One per guild, for the life of the cog. Events are handled strictly one
+        at a time, so playback state needs no locks and skip/stop/track-ended
+        can't interleave halfway through each other.
+        """
+        state = self.state_for(guild_id)
+        while True:
+            event = await state.events.get()
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                continue
+            try:
+                await self.handle_player_event(guild, state, event)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise  # the loop itself is being cancelled (cog unload)
+                LOG.exception("Music: player loop handler cancelled on %r in guild %s", event.kind, guild_id)
+            except Exception:
+                LOG.exception("Music: player loop failed handling %r in guild %s", event.kind, guild_id)
+
+    async def handle_player_event(self, guild: discord.Guild, state: GuildMusicState, event: PlayerEvent) -> None:
+        vc = state.voice_client or guild.voice_client
+        kind = event.kind
+
+        if kind == "play":
+            if vc and (vc.is_playing() or vc.is_paused()) or state.resolving is not None:
+                self.schedule_prefetch(state)
+                self.mark_dirty()
+            else:
+                await self.start_next(guild)
+            return
+
+        if kind in ("skip", "seek"):
+            if event.source is not state.source or state.current is None or not vc:
+                return  # that track already ended
+            if kind == "seek":
+                item = state.current
+                item.start_at = event.position
+                item.retries = 0
+                state.queue.appendleft(item)
+                state.quiet_start = True
+            state.stop_requested = True
+            vc.stop()  # its "ended" event starts whatever is next
+            return
+
+        if kind == "stop":
+            state.queue.clear()
+            state.pending_adds.clear()  # in-flight !play extractions are dropped too
+            state.cancel_resolve()
+            state.current = None
+            state.stop_requested = True
+            if vc and (vc.is_playing() or vc.is_paused()):
+                vc.stop()
+            self.mark_dirty()
+            self.check_idle(guild)
             return
-        await self.start_next(guild)
 
-    @commands.command(name="play")
+        if kind in ("ended", "error"):
+            if event.source is not state.source:
+                return  # a source we already replaced
+            if event.error is not None:
+                LOG.error("Music: player error", exc_info=event.error)
+                self.metrics.incr("player_errors")
+            self._retry_if_died_early(state, event.at)
+            # Only a track rolling straight into the next one counts as a gap
+            state.track_ended_at = event.at if state.queue else None
+            await self.start_next(guild)
+            return
+
+        if kind == "ready":
+            if event.item is not state.resolving:
+                # Stopped (or left) while it was resolving
+                if event.source is not None:
+                    event.source.cleanup()
+                return
+            state.resolving = None
+            state.resolve_task = None
+            if event.source is None:
+                await self.start_next(guild)  # unplayable; the resolver already said so
+            else:
+                await self.play_ready(guild, event.item, event.source)
+            return
+
+        LOG.warning("Music: unknown player event %r", kind)
+
+    def _retry_if_died_early(self, state: GuildMusicState, ended_at: Optional[float]) -> None:
+        """
+        ffmpeg exits quietly when its stream URL starts returning 403 mid-track,
+        which looks like the track ending early. If nobody skipped/stopped it,
+        put it back at the front with a fresh URL, resuming where it stopped.
+        """
+        item = state.current
+        intended = state.stop_requested
+        state.stop_requested = False
+        if intended or item is None or not item.duration or state.play_started_at is None:
+            return
+        if item.retries >= STREAM_RETRY_LIMIT:
+            return
+
+        position = self.playback_position(state, now=ended_at or time.monotonic())
+        if position >= item.duration - EARLY_END_SLACK:
+            return
+
+        LOG.info("Music: %s ended early at %.0fs, refreshing its stream URL", item.webpage_url, position)
+        self.metrics.incr("stream_retries")
+        item.retries += 1
+        item.start_at = position
+        item.local_path = None
+        item.expires_at = 0.0  # force re-extraction in resolve_item
+        state.queue.appendleft(item)
+
+    @commands.hybrid_command(name="play", description="Play a YouTube/Spotify link or search YouTube.")
+    @app_commands.describe(link="A YouTube or Spotify link, or start typing to search YouTube.")
     async def play_cmd(self, ctx: commands.Context, *, link: str) -> None:
         if not self.is_music_channel(ctx):
             await self.send_music_only_notice(ctx)
@@ -451,40 +2179,77 @@ class Music(commands.Cog):
         if not ctx.guild:
             return
 
+        await ctx.defer()  # slash invocations: extraction can outlast the 3s response window
+
         vc = await self.ensure_voice(ctx)
         if not vc:
             return
 
+        requested_at = time.monotonic()
         state = self.state_for(ctx.guild.id)
-        async with state.lock:
-            try:
-                items = await self.build_items_from_input(link.strip(), str(ctx.author.display_name))
-            except commands.BadArgument as e:
-                await ctx.reply(str(e), mention_author=False, delete_after=10)
-                return
-            except Exception as e:
-                await ctx.reply(str(e), mention_author=False, delete_after=12)
-                return
-
-            state.voice_client = vc
-            state.text_channel_id = MUSIC_TEXT_CHANNEL_ID
-            state.queue.extend(items)
-
-            if len(items) == 1:
-                duration_text = format_duration(items[0].duration)
-                desc = f"**{discord.utils.escape_markdown(items[0].title)}**\nRequested by {ctx.author.mention}"
-                if duration_text:
-                    desc += f"\nDuration: {duration_text}"
-                await self.send_embed(ctx.channel, "Queued", desc)
-            else:
-                await self.send_embed(
-                    ctx.channel,
-                    "Queued playlist",
-                    f"Added **{len(items)}** tracks to the queue for {ctx.author.mention}.",
+        slot = state.reserve_slot()
+        self.check_idle(ctx.guild)  # a pending extraction counts as busy: don't leave mid-!play
+        try:
+            # The slow part (yt-dlp / Spotify) runs unlocked and alongside other !play calls.
+            items = await self.build_items_from_input(link.strip(), str(ctx.author.display_name))
+        except Exception as e:
+            # Release our place; requests that finished behind us get queued now
+            if state.fill_slot(slot, []):
+                self.post(ctx.guild.id, PlayerEvent("play"))
+            delete_after = 10 if isinstance(e, commands.BadArgument) else 12
+            await ctx.reply(str(e), mention_author=False, delete_after=delete_after)
+            return
+        except BaseException:
+            if state.fill_slot(slot, []):
+                self.post(ctx.guild.id, PlayerEvent("play"))
+            raise
+
+        for item in items:
+            item.requester_id = ctx.author.id
+        if not state.queue and not state.current and state.pending_adds and state.pending_adds[0] is slot:
+            items[0].requested_at = requested_at  # only meaningful if it plays right away
+
+        if not state.holds_slot(slot):
+            return  # stopped while we were extracting
+        state.voice_client = vc
+        state.text_channel_id = MUSIC_TEXT_CHANNEL_ID
+        if state.fill_slot(slot, items):
+            self.post(ctx.guild.id, PlayerEvent("play"))
+        # else: an earlier request is still extracting; its fill_slot queues ours and posts "play"
+
+        # ctx.send answers the interaction for /play and posts normally for !play
+        if len(items) == 1:
+            duration_text = format_duration(items[0].duration)
+            desc = f"**{discord.utils.escape_markdown(items[0].title)}**\nRequested by {ctx.author.mention}"
+            if duration_text:
+                desc += f"\nDuration: {duration_text}"
+            await ctx.send(embed=discord.Embed(title="Queued", description=desc, color=EMBED_COLOR))
+        else:
+            await ctx.send(
+                embed=discord.Embed(
+                    title="Queued playlist",
+                    description=f"Added **{len(items)}** tracks to the queue for {ctx.author.mention}.",
+                    color=EMBED_COLOR,
                 )
+            )
 
-            if not vc.is_playing() and not vc.is_paused():
-                await self.start_next(ctx.guild)
+    @play_cmd.autocomplete("link")
+    async def play_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[app_commands.Choice[str]]:
+        hits = await self.suggestions.suggest(interaction.user.id, current)
+        choices: list[app_commands.Choice[str]] = []
+        for hit in hits[:AUTOCOMPLETE_RESULTS]:
+            label = hit.get("title") or hit["id"]
+            duration_text = format_duration(hit.get("duration"))
+            if duration_text:
+                label = f"{label[:90]} ({duration_text})"
+            choices.append(
+                app_commands.Choice(name=label[:100], value=f"https://www.youtube.com/watch?v={hit['id']}")
+            )
+        return choices
 
     @commands.command(name="skip")
     async def skip_cmd(self, ctx: commands.Context) -> None:
@@ -497,11 +2262,74 @@ class Music(commands.Cog):
 
         vc = ctx.guild.voice_client
         if vc.is_playing() or vc.is_paused():
-            vc.stop()
+            self.post(ctx.guild.id, PlayerEvent("skip", source=self.state_for(ctx.guild.id).source))
             await self.send_embed(ctx.channel, "Skipped", "Skipped the current track.")
         else:
             await ctx.reply("There's nothing to skip.", mention_author=False, delete_after=10)
 
+    def restart_current(self, guild_id: int, position: float) -> None:
+        """
+        Restart the current track at `position`. ffmpeg gets `-ss` before its
+        input (see build_source), so it seeks in the container/HTTP range
+        instead of decoding up to the offset.
+        """
+        state = self.state_for(guild_id)
+        self.post(guild_id, PlayerEvent("seek", source=state.source, position=position))
+
+    @commands.command(name="seek")
+    async def seek_cmd(self, ctx: commands.Context, *, position: str) -> None:
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+        if not ctx.guild or not ctx.guild.voice_client:
+            await ctx.reply("I'm not playing anything right now.", mention_author=False, delete_after=10)
+            return
+
+        vc = ctx.guild.voice_client
+        state = self.state_for(ctx.guild.id)
+        item = state.current
+        if item is None or not (vc.is_playing() or vc.is_paused()):
+            await ctx.reply("There's nothing to seek in.", mention_author=False, delete_after=10)
+            return
+
+        target = parse_seek(position, self.playback_position(state))
+        if target is None:
+            await ctx.reply("Use a time like `90`, `1:30`, `+30` or `-15`.", mention_author=False, delete_after=10)
+            return
+        target = max(0.0, target)
+        if item.duration and target >= item.duration:
+            await ctx.reply(
+                f"That's past the end ({format_duration(item.duration)}).", mention_author=False, delete_after=10
+            )
+            return
+
+        self.restart_current(ctx.guild.id, target)
+        await self.send_embed(
+            ctx.channel,
+            "Seeking",
+            f"**{discord.utils.escape_markdown(item.title)}** from {format_duration(target) or '0:00'}",
+        )
+
+    @commands.command(name="replay")
+    async def replay_cmd(self, ctx: commands.Context) -> None:
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+        if not ctx.guild or not ctx.guild.voice_client:
+            await ctx.reply("I'm not playing anything right now.", mention_author=False, delete_after=10)
+            return
+
+        vc = ctx.guild.voice_client
+        state = self.state_for(ctx.guild.id)
+        if state.current is None or not (vc.is_playing() or vc.is_paused()):
+            await ctx.reply("There's nothing to replay.", mention_author=False, delete_after=10)
+            return
+
+        self.restart_current(ctx.guild.id, 0.0)
+        await self.send_embed(
+            ctx.channel, "Replaying", f"**{discord.utils.escape_markdown(state.current.title)}** from the start"
+        )
+
     @commands.command(name="pause")
     async def pause_cmd(self, ctx: commands.Context) -> None:
         if not self.is_music_channel(ctx):
@@ -514,6 +2342,8 @@ class Music(commands.Cog):
         vc = ctx.guild.voice_client
         if vc.is_playing():
             vc.pause()
+            self.state_for(ctx.guild.id).paused_at = time.monotonic()
+            self.mark_dirty()
             await self.send_embed(ctx.channel, "Paused", "Playback paused.")
         else:
             await ctx.reply("There's nothing playing to pause.", mention_author=False, delete_after=10)
@@ -530,6 +2360,11 @@ class Music(commands.Cog):
         vc = ctx.guild.voice_client
         if vc.is_paused():
             vc.resume()
+            state = self.state_for(ctx.guild.id)
+            if state.paused_at is not None and state.play_started_at is not None:
+                state.play_started_at += time.monotonic() - state.paused_at
+            state.paused_at = None
+            self.mark_dirty()
             await self.send_embed(ctx.channel, "Resumed", "Playback resumed.")
         else:
             await ctx.reply("There's nothing paused right now.", mention_author=False, delete_after=10)
@@ -542,38 +2377,67 @@ class Music(commands.Cog):
         if not ctx.guild:
             return
 
+        view = QueuePagesView(self, ctx.guild.id, ctx.author.id)
+        embed = view.render()
+        if embed is None:
+            await ctx.reply("The queue is empty.", mention_author=False, delete_after=10)
+            return
+
+        if view.page_count() == 1:
+            await ctx.channel.send(embed=embed)
+            return
+        view.message = await ctx.channel.send(embed=embed, view=view)
+
+    def _queue_position(self, state: GuildMusicState, number: int) -> Optional[int]:
+        """1-based position from !queue → 0-based index, or None if out of range."""
+        index = number - 1
+        return index if 0 <= index < len(state.queue) else None
+
+    @commands.command(name="remove")
+    async def remove_cmd(self, ctx: commands.Context, number: int) -> None:
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+        if not ctx.guild:
+            return
+
         state = self.state_for(ctx.guild.id)
-        lines: list[str] = []
+        index = self._queue_position(state, number)
+        if index is None:
+            await ctx.reply("There's no track at that position.", mention_author=False, delete_after=10)
+            return
 
-        if state.current:
-            now_line = f"**Now:** {discord.utils.escape_markdown(state.current.title)}"
-            now_duration = format_duration(state.current.duration)
-            if now_duration:
-                now_line += f" ({now_duration})"
-            lines.append(now_line)
+        item = state.queue.remove_at(index)
+        self.schedule_prefetch(state)
+        self.mark_dirty()
+        await self.send_embed(ctx.channel, "Removed", f"**{discord.utils.escape_markdown(item.title)}**")
 
-        if state.queue:
-            preview = state.queue[:10]
-            if lines:
-                lines.append("")
-            lines.append("**Up next:**")
-            for idx, item in enumerate(preview, start=1):
-                line = f"{idx}. {discord.utils.escape_markdown(item.title)}"
-                duration_text = format_duration(item.duration)
-                if duration_text:
-                    line += f" ({duration_text})"
-                lines.append(line)
-            if len(state.queue) > 10:
-                lines.append(f"…and **{len(state.queue) - 10}** more.")
+    @commands.command(name="move")
+    async def move_cmd(self, ctx: commands.Context, number: int, to: int) -> None:
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+        if not ctx.guild:
+            return
 
-        if not lines:
-            await ctx.reply("The queue is empty.", mention_author=False, delete_after=10)
+        state = self.state_for(ctx.guild.id)
+        src = self._queue_position(state, number)
+        dst = self._queue_position(state, to)
+        if src is None or dst is None:
+            await ctx.reply("Both positions must be in the queue.", mention_author=False, delete_after=10)
             return
 
-        await self.send_embed(ctx.channel, "Music queue", "\n".join(lines))
+        item = state.queue.move(src, dst)
+        self.schedule_prefetch(state)
+        self.mark_dirty()
+        await self.send_embed(
+            ctx.channel,
+            "Moved",
+            f"**{discord.utils.escape_markdown(item.title)}** is now #{to}.",
+        )
 
-    @commands.command(name="stop")
-    async def stop_cmd(self, ctx: commands.Context) -> None:
+    @commands.command(name="shuffle")
+    async def shuffle_cmd(self, ctx: commands.Context) -> None:
         if not self.is_music_channel(ctx):
             await self.send_music_only_notice(ctx)
             return
@@ -581,13 +2445,62 @@ class Music(commands.Cog):
             return
 
         state = self.state_for(ctx.guild.id)
-        state.queue.clear()
-        state.current = None
+        if len(state.queue) < 2:
+            await ctx.reply("Not enough tracks to shuffle.", mention_author=False, delete_after=10)
+            return
 
-        vc = ctx.guild.voice_client
-        if vc and (vc.is_playing() or vc.is_paused()):
-            vc.stop()
+        state.queue.shuffle()
+        self.schedule_prefetch(state)
+        self.mark_dirty()
+        await self.send_embed(ctx.channel, "Shuffled", f"Shuffled **{len(state.queue)}** tracks.")
+
+    @commands.command(name="dedupe")
+    async def dedupe_cmd(self, ctx: commands.Context) -> None:
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+        if not ctx.guild:
+            return
+
+        state = self.state_for(ctx.guild.id)
+        removed = state.queue.dedupe()
+        self.schedule_prefetch(state)
+        self.mark_dirty()
+        await self.send_embed(ctx.channel, "Deduplicated", f"Removed **{removed}** duplicate track(s).")
+
+    @commands.command(name="clearuser")
+    async def clearuser_cmd(self, ctx: commands.Context, member: Optional[discord.Member] = None) -> None:
+        """Remove your queued tracks (mods can name someone else)."""
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+        if not ctx.guild or not isinstance(ctx.author, discord.Member):
+            return
+
+        target = member or ctx.author
+        if target.id != ctx.author.id and not permissions.is_mod_member(ctx.author):
+            await ctx.reply("You can only clear your own tracks.", mention_author=False, delete_after=10)
+            return
+
+        state = self.state_for(ctx.guild.id)
+        removed = state.queue.remove_by_user(target.id)
+        self.schedule_prefetch(state)
+        self.mark_dirty()
+        await self.send_embed(
+            ctx.channel,
+            "Cleared",
+            f"Removed **{removed}** track(s) queued by {target.mention}.",
+        )
+
+    @commands.command(name="stop")
+    async def stop_cmd(self, ctx: commands.Context) -> None:
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+        if not ctx.guild:
+            return
 
+        self.post(ctx.guild.id, PlayerEvent("stop"))
         await self.send_embed(ctx.channel, "Stopped", "Playback stopped and the queue was cleared.")
 
     @commands.command(name="leave")
@@ -598,21 +2511,69 @@ class Music(commands.Cog):
         if not ctx.guild:
             return
 
-        state = self.state_for(ctx.guild.id)
-        state.queue.clear()
-        state.current = None
+        await self.teardown_voice(ctx.guild)
+        await self.send_embed(ctx.channel, "Disconnected", "Left voice and cleared the queue.")
 
-        vc = ctx.guild.voice_client
-        if vc and vc.is_connected():
-            try:
-                await vc.disconnect(force=True)
-            except Exception:
-                LOG.exception("Music: failed to disconnect")
-                await ctx.reply("I couldn't leave the voice channel cleanly.", mention_author=False, delete_after=10)
-                return
+    def metrics_export(self) -> dict:
+        """Machine-readable snapshot of every music metric and gauge."""
+        return {
+            "histograms": {name: h.export() for name, h in self.metrics.histograms.items()},
+            "counters": dict(self.metrics.counters),
+            "gauges": {
+                **self.resource_gauge(),
+                "queue_lengths": {str(gid): len(st.queue) for gid, st in self.states.items() if st.queue},
+                "extract_cache_entries": len(self.extract_cache._entries),
+                "extract_cache_hits": self.extract_cache.hits,
+                "extract_cache_misses": self.extract_cache.misses,
+            },
+        }
 
-        state.voice_client = None
-        await self.send_embed(ctx.channel, "Disconnected", "Left voice and cleared the queue.")
+    @commands.command(name="musicstats")
+    async def musicstats_cmd(self, ctx: commands.Context, fmt: str = "") -> None:
+        """Latency histograms, error counters and gauges. `!musicstats json` attaches the raw export."""
+        if not self.is_music_channel(ctx):
+            await self.send_music_only_notice(ctx)
+            return
+
+        export = self.metrics_export()
+        if fmt.lower() == "json":
+            payload = json.dumps(export, indent=2).encode("utf-8")
+            await ctx.channel.send(file=discord.File(io.BytesIO(payload), filename="musicstats.json"))
+            return
+
+        def _fmt_s(value: Optional[float]) -> str:
+            return "—" if value is None else f"{value:g}s"
+
+        lines: list[str] = []
+        for name, hist in self.metrics.histograms.items():
+            label = name.removesuffix("_seconds").replace("_", " ")
+            lines.append(
+                f"**{label}** · n={hist.count} · p50≤{_fmt_s(hist.quantile(0.5))}"
+                f" · p95≤{_fmt_s(hist.quantile(0.95))} · max {_fmt_s(round(hist.max, 2) if hist.count else None)}"
+            )
+        lines.append("")
+        lines.extend(f"{name.replace('_', ' ')}: **{n}**" for name, n in self.metrics.counters.items())
+        lines.append("")
+        gauges = export["gauges"]
+        lines.append(
+            f"voice clients: **{gauges['voice_clients']}** · ffmpeg: **{gauges['ffmpeg_processes']}**"
+            f" · queued: **{sum(gauges['queue_lengths'].values())}**"
+        )
+        lines.append(
+            f"extract cache: **{gauges['extract_cache_entries']}** entries,"
+            f" {gauges['extract_cache_hits']} hits / {gauges['extract_cache_misses']} misses"
+        )
+        await self.send_embed(ctx.channel, "Music stats", "\n".join(lines))
+
+    @commands.command(name="voicestats")
+    async def voicestats_cmd(self, ctx: commands.Context) -> None:
+        """Mod-only: voice connections, ffmpeg children and timers held right now."""
+        if not isinstance(ctx.author, discord.Member) or not permissions.is_mod_member(ctx.author):
+            return
+
+        gauge = self.resource_gauge()
+        lines = [f"{name.replace('_', ' ')}: **{value}**" for name, value in gauge.items()]
+        await self.send_embed(ctx.channel, "Music resources", "\n".join(lines))
 
 
 async def setup(bot: commands.Bot) -> None: